@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from collections.abc import Mapping
@@ -19,14 +20,44 @@ from homeassistant.helpers.dispatcher import (
     async_dispatcher_send,
 )
 from homeassistant.helpers.entity import DeviceInfo, Entity
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 
 # pylint: disable=maybe-no-member
 from webuntis import errors
-from .utils.web_untis_extended import ExtendedSession
-from .utils.homework import return_homework_events
-from .utils.exams import return_exam_events
+from .utils.web_untis_extended import (
+    ELEMENT_TYPES,
+    MASTER_DATA_LISTS,
+    ExtendedSession,
+)
+from .utils.rate_limit import async_get_rate_limiter
+from .utils.homework import (
+    HomeworkCache,
+    async_return_homework_events,
+    return_cached_homework_events,
+)
+from .utils.exams import (
+    ExamCache,
+    async_return_exam_events,
+    return_cached_exam_events,
+)
 from .utils.web_untis import get_lesson_name
+from .utils.snapshot import (
+    SharedTimetable,
+    TimetableCache,
+    async_get_shared_timetable,
+    raw_data,
+)
+from .utils.master_data import async_acquire_master_data, async_release_master_data
+from .utils.scheduler import (
+    async_get_update_semaphore,
+    first_update_delay,
+    next_update_delay,
+    staggered_delay,
+    update_backoff,
+    update_phase,
+)
 
 
 from .const import (
@@ -34,16 +65,20 @@ from .const import (
     DAYS_TO_FUTURE,
     DEFAULT_OPTIONS,
     DOMAIN,
-    SCAN_INTERVAL,
+    SESSION_LIFETIME,
+    SESSION_SAVE_DELAY,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
     SIGNAL_NAME_PREFIX,
+    TIMETABLE_TIERS,
     NAME_EVENT_LESSON_CHANGE,
     NAME_EVENT_HOMEWORK,
 )
 from .notify import *
 from .services import async_setup_services
-from .utils.utils import compact_list, async_notify
+from .utils.utils import async_get_http_session, compact_list, async_notify
 
-from .utils.web_untis import get_timetable_object
+from .utils.web_untis import async_get_timetable_object
 
 PLATFORMS = [Platform.SENSOR, Platform.CALENDAR, Platform.EVENT]
 
@@ -66,10 +101,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     server = WebUntis(hass, unique_id, entry)
     domain_data[unique_id] = server
 
+    await server.async_load_session()
+    await server.async_load_caches()
+
     # Set up platforms.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    await server.async_update()
+    # The entities start with the stored data, the first update runs in the background.
     server.start_periodic_update()
 
     # Register update listener.
@@ -82,9 +120,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_update_entry(hass, entry):
     """Handle options update."""
+    server = hass.data.get(DOMAIN, {}).get(entry.unique_id)
+    if server is not None and not server.config_changed(entry):
+        # only cached data like the timetable element was stored
+        return
+
     await hass.config_entries.async_reload(entry.entry_id)
 
 
+# Data stored per config entry, removed together with the entry.
+ENTRY_STORES = ("session", "holidays", "exams", "snapshot")
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data of a config entry."""
+    for name in ENTRY_STORES:
+        await entry_store(hass, entry, name).async_remove()
+        for child in entry.data.get("children", []):
+            await entry_store(hass, entry, f"{child['id']}.{name}").async_remove()
+
+
+def entry_store(hass: HomeAssistant, entry: ConfigEntry, name: str) -> Store:
+    """Return a store for data of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.{name}")
+
+
+def _without_cached_data(data: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the entry data without the data cached by the integration."""
+    return {key: value for key, value in data.items() if key != "timetable_element"}
+
+
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     """Migrate old entry."""
     _LOGGER.debug("Migrating from version %s", config_entry.version)
@@ -149,6 +214,8 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
 
     # Clean up.
     server.stop_periodic_update()
+    for view in (server, *server.children):
+        async_release_master_data(hass, view.server, view.school)
     hass.data[DOMAIN].pop(unique_id)
 
     return unload_ok
@@ -162,10 +229,19 @@ class WebUntis:
         hass: HomeAssistant,
         unique_id: str,
         config: Mapping[str, Any],
+        parent: WebUntis | None = None,
+        child: dict | None = None,
     ) -> None:
-        """Initialize client instance."""
+        """
+        Initialize client instance. With a parent account, the entry creates a
+        view per child that uses the session of the parent.
+        """
         self._hass = hass
         self._config = config
+        self._config_data = _without_cached_data(config.data)
+        self._config_options = dict(config.options)
+        self._parent = parent
+        self._child = child
 
         # Server data
         self.unique_id = unique_id
@@ -176,6 +252,11 @@ class WebUntis:
         self.timetable_source = config.data["timetable_source"]
         self.timetable_source_id = config.data["timetable_source_id"]
         self.title = config.title
+        self.device_name = self.username
+        if child is not None:
+            self.timetable_source = "student"
+            self.timetable_source_id = child["name"]
+            self.title = self.device_name = child["name"]
 
         self.calendar_show_cancelled_lessons = config.options[
             "calendar_show_cancelled_lessons"
@@ -198,7 +279,8 @@ class WebUntis:
         self.filter_klassen = config.options.get("filter_klassen", [])
         self.exclude_filter_comparison = config.options["exclude_filter_comparison"]
 
-        self.exclude_data = config.options["exclude_data"]
+        # a copy, the options of the entry are only changed by exclude_data_
+        self.exclude_data = list(config.options["exclude_data"])
         self.exclude_data_run = []
 
         self.filter_description = config.options["filter_description"]
@@ -213,23 +295,49 @@ class WebUntis:
             config.get("options") for config in self.notify_config.values()
         )
 
-        self.session = ExtendedSession(
-            username=self.username,
-            password=self.password,
-            server=self.server,
-            useragent="foo",
-            school=self.school,
-        )
+        if parent is not None:
+            # one login for all children
+            self.session = parent.session
+        else:
+            self.session = ExtendedSession(
+                username=self.username,
+                password=self.password,
+                server=self.server,
+                useragent="foo",
+                school=self.school,
+                http_session=async_get_http_session(hass),
+                on_login=self._async_session_renewed,
+                rate_limiter=async_get_rate_limiter(hass, self.server),
+            )
         self._loged_in = False
+        self._session_store = self._store("session")
+        self._holiday_store = self._store("holidays")
+        self._snapshot_store = self._store("snapshot")
+        self._session_expires = None
         self._last_status_request_failed = False
         self._no_lessons = False
-        self.updating = 0
+        # update cycles and service calls holding the session
+        self._session_leases = 0
+        self._session_lock = asyncio.Lock()
         self.issue = False
 
         # Data provided by 3rd party library
         self.schoolyears = None
         self.current_schoolyear = None
         self.student_id = None
+        self.timetable = None
+        self._timetable_cache = TimetableCache(TIMETABLE_TIERS)
+        # raw days shared with the entries that watch the same element
+        self._shared_timetable = SharedTimetable(TIMETABLE_TIERS)
+        self._shared_timetable_key = None
+        self.last_import_time = None
+        self._import_time_supported = True
+        # last time the timetable was confirmed to be current
+        self.data_updated: datetime | None = None
+        self.holidays = []
+        self._holidays_schoolyear_id = None
+        self._exam_cache = ExamCache(self._store("exams"))
+        self._homework_cache = HomeworkCache()
 
         # sensor data
         self.next_class = None
@@ -246,6 +354,13 @@ class WebUntis:
 
         self.subjects = []
         self.klassen = []
+        # master data of the school, shared with the other entries
+        self._shared_master_data = async_acquire_master_data(
+            hass, self.server, self.school
+        )
+        self._master_data_fetched = None
+        # lists that failed for this entry: their error
+        self._unavailable_master_data = {}
 
         self.event_list = []
         self.unfiltered_event_list = []
@@ -257,10 +372,39 @@ class WebUntis:
 
         # Callback for stopping periodic update.
         self._stop_periodic_update: CALLBACK_TYPE | None = None
+        self._periodic_update = False
+        # position of the updates of this entry within the polling interval,
+        # entries of the same timetable share it, so one of them fetches the
+        # timetable and the others reuse it in the same slot
+        source_id = (
+            self.username
+            if self.timetable_source in ("personal", "parent")
+            else self.timetable_source_id
+        )
+        self._update_phase = update_phase(
+            f"{self.server}/{self.school}/{self.timetable_source}/{source_id}".lower()
+        )
+
+        # durations of the update cycles, see diagnostics
+        self.update_stats = {
+            "cycles": 0,
+            "last_duration": None,
+            "last_wait": None,
+            "backoff": 0,
+        }
 
         self.lesson_change_callback = None
         self.homework_change_callback = None
 
+        # views of the children of a parent account
+        self.children = []
+        self._children_checked: date | None = None
+        if self.timetable_source == "parent":
+            self.children = [
+                WebUntis(hass, f"{unique_id}_{child['id']}", config, self, child)
+                for child in config.data.get("children", [])
+            ]
+
     def event_entity_listen(self, callback, id) -> None:
         """Listen for lesson change events."""
         if id == NAME_EVENT_LESSON_CHANGE:
@@ -268,34 +412,166 @@ class WebUntis:
         elif id == NAME_EVENT_HOMEWORK:
             self.homework_change_callback = callback
 
+    def _store(self, name: str) -> Store:
+        """Return a store of the entry, the views of children use their own."""
+        if self._child is not None:
+            name = f"{self._child['id']}.{name}"
+        return entry_store(self._hass, self._config, name)
+
+    @property
+    def has_homework(self) -> bool:
+        """
+        Whether the entry has homework and exams. Teachers have none, and the
+        endpoints only return the data of the logged in student, not of the
+        children of a parent account.
+        """
+        return self.timetable_source != "teacher" and self._child is None
+
+    @property
+    def views(self) -> list[WebUntis]:
+        """The objects that provide entities, the children of a parent account."""
+        return self.children or [self]
+
     def start_periodic_update(self) -> None:
-        """Start periodic execution of update method."""
-        self._stop_periodic_update = async_track_time_interval(
-            self._hass, self.async_update, timedelta(seconds=SCAN_INTERVAL)
+        """
+        Start periodic execution of update method. Without stored data the
+        first update runs now. Otherwise the stored data is served until it
+        is due, in the slot of the entry, so the entries do not all update
+        right after a restart.
+        """
+        if self._periodic_update:
+            return
+        self._periodic_update = True
+        if any(view.data_age is None for view in self.views):
+            self._hass.async_create_background_task(
+                self._async_scheduled_update(dt_util.utcnow()),
+                f"{DOMAIN} update {self.unique_id}",
+            )
+            return
+
+        timestamp = dt_util.utcnow().timestamp()
+        # the interval the entry polls with now, e.g. hourly outside of school
+        remaining = self._next_update_delay() - max(
+            view.data_age for view in self.views
+        )
+        if remaining > 0:
+            delay = staggered_delay(timestamp, remaining, self._update_phase)
+        else:
+            delay = first_update_delay(timestamp, self._update_phase)
+        _LOGGER.debug(
+            "First update of '%s@%s' in %s",
+            self.school,
+            self.username,
+            timedelta(seconds=int(delay)),
+        )
+        self._stop_periodic_update = async_call_later(
+            self._hass, delay, self._async_scheduled_update
         )
 
     def stop_periodic_update(self) -> None:
         """Stop periodic execution of update method."""
+        self._periodic_update = False
         if self._stop_periodic_update:
             self._stop_periodic_update()
+            self._stop_periodic_update = None
+
+    def _next_update_delay(self) -> float:
+        """Seconds until the next update depending on the school hours."""
+        # the children of a parent account go to the same school
+        timetables = [view.timetable for view in self.views if view.timetable]
+        schoolyear = next(
+            (view.current_schoolyear for view in self.views if view.current_schoolyear),
+            None,
+        )
+        delay = next_update_delay(
+            datetime.now(),
+            [lesson for timetable in timetables for lesson in timetable.lessons]
+            if timetables
+            else None,
+            schoolyear.end.date() if schoolyear else None,
+            self.views[0].holidays,
+        )
+        # a slow server gets more time between the updates
+        return max(delay, self.update_stats["backoff"])
+
+    @callback
+    def _schedule_next_update(self) -> None:
+        """Schedule the next update in the slot of the entry."""
+        if not self._periodic_update:
+            return
+
+        delay = staggered_delay(
+            dt_util.utcnow().timestamp(), self._next_update_delay(), self._update_phase
+        )
+        _LOGGER.debug(
+            "Next update of '%s@%s' in %s",
+            self.school,
+            self.username,
+            timedelta(seconds=int(delay)),
+        )
+        self._stop_periodic_update = async_call_later(
+            self._hass, delay, self._async_scheduled_update
+        )
+
+    async def _async_scheduled_update(self, now: datetime) -> None:
+        """Run a scheduled update and schedule the next one."""
+        self._stop_periodic_update = None
+        try:
+            await self.async_update()
+        finally:
+            self._schedule_next_update()
 
     # pylint: disable=unused-argument
     async def async_update(self, now: datetime | None = None) -> None:
-        """Get server data from 3rd party library and update properties."""
-
-        await self._async_status_request()
+        """
+        Get server data from 3rd party library and update properties. Only
+        MAX_CONCURRENT_UPDATES entries update at the same time, the time
+        waiting for the others does not count as duration of the update.
+        """
+        queued = dt_util.utcnow()
+        async with async_get_update_semaphore(self._hass):
+            started = dt_util.utcnow()
+            self.update_stats["last_wait"] = (started - queued).total_seconds()
+            try:
+                await self._async_status_request()
+            finally:
+                self._update_backoff(started)
 
         # Notify sensors about new data.
-        async_dispatcher_send(self._hass, self.signal_name)
+        for view in self.views:
+            async_dispatcher_send(self._hass, view.signal_name)
+
+    @callback
+    def _update_backoff(self, started: datetime) -> None:
+        """Record the duration of an update cycle and adapt the backoff to it."""
+        duration = (dt_util.utcnow() - started).total_seconds()
+        stats = self.update_stats
+        stats["cycles"] += 1
+        stats["last_duration"] = duration
+        stats["backoff"] = update_backoff(stats["backoff"], duration)
+        if stats["backoff"]:
+            _LOGGER.debug(
+                "Update of '%s@%s' took %.1fs, backing off to %ss",
+                self.school,
+                self.username,
+                duration,
+                stats["backoff"],
+            )
 
     async def _async_status_request(self) -> None:
         """Request status and update properties."""
 
-        if self.exclude_data_run:
-            for i in self.exclude_data_run:
-                self.exclude_data_(i)
+        for view in self.views:
+            for i in list(view.exclude_data_run):
+                view.exclude_data_(i)
 
-        login_error = await self._hass.async_add_executor_job(self.webuntis_login)
+        login_error = await self.async_webuntis_login()
+
+        if not login_error:
+            try:
+                login_error = await self._async_update_data()
+            finally:
+                await self.async_webuntis_logout()
 
         if login_error:
             if str(login_error) == "bad credentials":
@@ -313,103 +589,215 @@ class WebUntis:
                         "entry_id": self._config.entry_id,
                     },
                 )
+            for view in self.views:
+                view._serve_cached_data()
             return
         elif self.issue:
             _LOGGER.info("delete issue bad_credentials")
             ir.async_delete_issue(self._hass, DOMAIN, "bad_credentials")
             self.issue = False
 
-        # _LOGGER.debug("updating data")
-
+    async def _async_update_data(self) -> Exception | None:
+        """Fetch the data of a cycle, returns the error if the login is invalid."""
+        # The first request of the cycle validates a reused session.
         try:
-            self.schoolyears = await self._hass.async_add_executor_job(
-                self.session.schoolyears
+            import_time = await self._async_get_last_import_time()
+        except errors.BadCredentialsError as error:
+            _LOGGER.warning(
+                "Login to WebUntis '%s@%s' failed - OSError: %s",
+                self.school,
+                self.username,
+                error,
             )
-            self.current_schoolyear = await self._hass.async_add_executor_job(
-                lambda: self.schoolyears.current
+            self._last_status_request_failed = True
+            self._loged_in = False
+            return error
+
+        if self.children:
+            # the children are updated concurrently through the one session
+            await self._async_update_children()
+            await asyncio.gather(
+                *(child._async_update_view(import_time) for child in self.children)
             )
+        else:
+            await self._async_update_view(import_time)
 
-            if not self.current_schoolyear:
-                # Login error, set all properties to unknown.
-                self.next_class = None
-                self.next_class_json = None
-                self.next_lesson_to_wake_up = None
-                self.calendar_events = []
-                self.calendar_homework = []
-                self.next_day_json = None
-                self.day_json = None
-                self.today = [None, None]
+        return None
 
-                # Inform user once about failed update if necessary.
-                if not self._last_status_request_failed:
-                    _LOGGER.info(
-                        "No active schoolyear '%s@%s'",
-                        self.school,
-                        self.username,
-                    )
-                    _LOGGER.info(
-                        "Found schoolyears for '%s@%s': %s (%s)",
-                        self.school,
-                        self.username,
-                        self.schoolyears,
-                        self.current_schoolyear,
-                    )
-                self._last_status_request_failed = True
-                await self._hass.async_add_executor_job(self.webuntis_logout)
-                return
+    async def _async_update_children(self) -> None:
+        """Look up the children of a parent account once a day."""
+        today = date.today()
+        if self._children_checked == today:
+            return
 
+        try:
+            children = await self.session.async_get_children()
         except OSError as error:
             _LOGGER.warning(
-                "Request for schoolyears of '%s@%s' failed - OSError: %s",
+                "Updating the children of '%s@%s' failed - OSError: %s",
                 self.school,
                 self.username,
                 error,
             )
+            return
 
-        try:
-            self.subjects = await self._hass.async_add_executor_job(
-                self.session.subjects
-            )
-        except OSError as error:
-            self.subjects = []
-
+        self._children_checked = today
+        if not children:
+            # like the config flow, an empty list is not taken over, the views
+            # of the last known children are kept
             _LOGGER.warning(
-                "Updating the subjects of '%s@%s' failed - OSError: %s",
+                "No children found for '%s@%s', keeping the last known children",
                 self.school,
                 self.username,
-                error,
             )
-
-        try:
-            self.klassen = await self._hass.async_add_executor_job(
-                self.session.klassen
+            return
+        if children != self._config.data.get("children"):
+            _LOGGER.info(
+                "Children of '%s@%s' changed: %s", self.school, self.username, children
+            )
+            # the update listener reloads the entry with a view per child
+            self._hass.config_entries.async_update_entry(
+                self._config, data={**self._config.data, "children": children}
             )
-        except OSError as error:
-            self.klassen = []
 
-            _LOGGER.warning(
-                "Updating the classes (klassen) of '%s@%s' failed - OSError: %s",
+    async def _async_update_view(self, import_time) -> None:
+        """Fetch the data of the entities, children share the import time."""
+        # _LOGGER.debug("updating data")
+
+        if self._timetable_unchanged(import_time):
+            # Only the time dependent properties are recomputed from the
+            # snapshot. Exams and homework are not part of the timetable
+            # import and are still fetched.
+            _LOGGER.debug(
+                "Timetable of '%s@%s' unchanged since last import",
                 self.school,
                 self.username,
-                error,
+            )
+            param_list, _ = await self._async_gather_parts(
+                self._async_update_homework(),
+                self._async_update_exams(),
+            )
+            self.data_updated = dt_util.utcnow()
+        else:
+            # Independent requests run concurrently, the session limits how many
+            # are in flight. The timetable window, exams and homework need the
+            # current schoolyear and the student id first.
+            has_schoolyear, _ = await self._async_gather_parts(
+                self._async_update_master_data(),
+                self._async_update_student_id(),
             )
 
-        try:
-            self.student_id = await self._hass.async_add_executor_job(
-                self.get_student_id
+            if not has_schoolyear:
+                return
+
+            param_list, _, timetable_updated, _ = await self._async_gather_parts(
+                self._async_update_homework(),
+                self._async_update_exams(),
+                self._async_update_timetable(),
+                self._async_update_holidays(),
             )
-        except OSError as error:
-            self.subjects = []
+            if timetable_updated:
+                self.last_import_time = import_time
+                self.data_updated = dt_util.utcnow()
+
+        self._update_properties()
+
+        if self.has_homework and param_list is not None:
+            if self.calendar_homework_ids_setup:
+                for event in param_list:
+                    if event["homework_id"] not in self.calendar_homework_ids:
+                        self.calendar_homework_ids.append(event["homework_id"])
+
+                        self.homework_change_callback(
+                            "homework", {"homework_data": event}
+                        )
+
+                        for service in self.notify_config.values():
+                            if "homework" in service.get("options", []):
+                                data = {
+                                    "data": service.get("data", {}),
+                                    "target": service.get("target", {}),
+                                }
+
+                                dic, notify_data = get_notification_data_homework(
+                                    event, service, self.title, self
+                                )
+
+                                for key, value in notify_data.items():
+                                    data["data"][key] = value
+
+                                data.update(dic)
 
+                                await async_notify(
+                                    self._hass,
+                                    service_id=service["entity_id"],
+                                    data=data,
+                                )
+
+            else:
+                self.calendar_homework_ids_setup = True
+
+            self.calendar_homework_ids = []
+            for event in param_list:
+                self.calendar_homework_ids.append(event["homework_id"])
+
+        try:
+            await self.update_notify()
+        except OSError as error:
             _LOGGER.warning(
-                "Updating the student_id of '%s@%s' failed - OSError: %s",
+                "Updating lesson changes '%s@%s' failed - OSError: %s",
                 self.school,
                 self.username,
                 error,
             )
 
+        self._snapshot_store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    async def _async_gather_parts(self, *parts) -> list:
+        """
+        Run parts of the update concurrently. A part that fails unexpectedly,
+        e.g. on data it cannot parse, is logged and returns None, so it does
+        not stop the other parts and the entities from being updated.
+        """
+        results = await asyncio.gather(*parts, return_exceptions=True)
+        for index, (part, result) in enumerate(zip(parts, results)):
+            if not isinstance(result, BaseException):
+                continue
+            if not isinstance(result, Exception):
+                raise result
+            _LOGGER.error(
+                "Updating %s of '%s@%s' failed - %s: %s",
+                part.__name__,
+                self.school,
+                self.username,
+                type(result).__name__,
+                result,
+                exc_info=result,
+            )
+            results[index] = None
+        return results
+
+    def _serve_cached_data(self) -> None:
+        """Recompute the properties from the cached data while offline."""
+        if self.current_schoolyear:
+            # the window moves with the day, the cache may still cover it
+            today = date.today()
+            self.timetable = self._timetable_cache.snapshot(
+                *self._timetable_window(today), today
+            )
+        self._update_properties()
+
+    @property
+    def data_age(self) -> int | None:
+        """Seconds since the timetable was last confirmed to be current."""
+        if self.data_updated is None:
+            return None
+        return int((dt_util.utcnow() - self.data_updated).total_seconds())
+
+    def _update_properties(self) -> None:
+        """Compute the sensor and calendar properties from the fetched data."""
         try:
-            self.next_class = await self._hass.async_add_executor_job(self._next_class)
+            self.next_class = self._next_class()
         except OSError as error:
             self.next_class = None
 
@@ -421,9 +809,7 @@ class WebUntis:
             )
 
         try:
-            self.next_lesson_to_wake_up = await self._hass.async_add_executor_job(
-                self._next_lesson_to_wake_up
-            )
+            self.next_lesson_to_wake_up = self._next_lesson_to_wake_up()
         except OSError as error:
             self.next_lesson_to_wake_up = None
 
@@ -435,9 +821,7 @@ class WebUntis:
             )
 
         try:
-            self.next_day_json = await self._hass.async_add_executor_job(
-                self._next_day_json
-            )
+            self.next_day_json = self._next_day_json()
         except OSError as error:
             self.next_day_json = None
 
@@ -449,7 +833,7 @@ class WebUntis:
             )
 
         try:
-            self.day_json = await self._hass.async_add_executor_job(self._day_json)
+            self.day_json = self._day_json()
         except OSError as error:
             self.day_json = None
 
@@ -461,9 +845,7 @@ class WebUntis:
             )
 
         try:
-            self.calendar_events = await self._hass.async_add_executor_job(
-                self._get_events
-            )
+            self.calendar_events = self._get_events()
             self.calendar_events = compact_list(
                 self.calendar_events,
                 "calendar",
@@ -479,136 +861,415 @@ class WebUntis:
                 error,
             )
 
-        if self.timetable_source != "teacher":
-            try:
-                self.calendar_exams = await self._hass.async_add_executor_job(
-                    return_exam_events, self
-                )
-            except OSError as error:
-                self.calendar_exams = []
+        try:
+            self.today = self._today()
+        except OSError as error:
+            self.today = [None, None]
 
-                _LOGGER.warning(
-                    "Updating the property calendar_exams of '%s@%s' failed - OSError: %s",
-                    self.school,
-                    self.username,
-                    error,
-                )
+            _LOGGER.warning(
+                "Updating the property today-sensor of '%s@%s' failed - OSError: %s",
+                self.school,
+                self.username,
+                error,
+            )
 
-            try:
-                (
-                    self.calendar_homework,
-                    param_list,
-                ) = await self._hass.async_add_executor_job(
-                    return_homework_events, self
-                )
-            except OSError as error:
-                self.calendar_homework = []
+    async def _async_get_last_import_time(self) -> int | None:
+        """Cheap probe for changes of the timetable, None if unknown."""
+        if not self._import_time_supported:
+            return None
 
-                _LOGGER.warning(
-                    "Updating the property calendar_homework of '%s@%s' failed - OSError: %s",
-                    self.school,
-                    self.username,
-                    error,
+        try:
+            return await self.session.async_last_import_time()
+        except errors.BadCredentialsError:
+            raise
+        except errors.MethodNotFoundError:
+            self._import_time_supported = False
+        except OSError as error:
+            _LOGGER.debug(
+                "Request for the last import time of '%s@%s' failed - OSError: %s",
+                self.school,
+                self.username,
+                error,
+            )
+        return None
+
+    def _timetable_unchanged(self, import_time) -> bool:
+        """Check if the timetable snapshot is still valid for this cycle"""
+        return (
+            import_time is not None
+            and import_time == self.last_import_time
+            and self.timetable is not None
+            and self.current_schoolyear is not None
+            # the window of the snapshot moves with the day
+            and self.timetable.fetched_at.date() == date.today()
+        )
+
+    def _master_data_stale(self) -> bool:
+        """Master data is stale if the school has newer or stale shared data."""
+        shared = self._shared_master_data
+        return self._master_data_fetched != shared.fetched or shared.stale(
+            datetime.now()
+        )
+
+    async def async_refresh_master_data(self) -> None:
+        """Refresh the master data on demand, e.g. for the lists of the options flow."""
+        if await self.async_webuntis_login():
+            return
+
+        try:
+            await self._async_update_master_data(force=True)
+        finally:
+            await self.async_webuntis_logout()
+
+    async def _async_update_master_data(self, force=False) -> bool:
+        """
+        Update schoolyears, subjects, klassen, rooms and teachers with one
+        batch request, returns False if there is no current schoolyear.
+        Until the master data is stale, the cached data is kept.
+
+        The lists are shared by the entries of the same school, only one of
+        them fetches the lists while the others wrap its data.
+
+        Rooms and teachers only fill the session cache, so the lazy lookups
+        of the lessons do not send blocking requests.
+        """
+        if not force and not self._master_data_stale():
+            return self.current_schoolyear is not None
+
+        lists = ["schoolyears", "subjects", "klassen", "rooms"]
+        if "teachers" not in self.exclude_data:
+            lists.append("teachers")
+        else:
+            self.session.clear_master_data("teachers")
+
+        shared = self._shared_master_data
+        async with shared.lock:
+            now = datetime.now()
+            if force or shared.stale(now):
+                self._unavailable_master_data = {}
+            available = [
+                name for name in lists if name not in self._unavailable_master_data
+            ]
+
+            if force or shared.stale(now) or shared.missing(available):
+                try:
+                    master_data = await self.session.async_master_data(lists)
+                except OSError as error:
+                    # keep the cached master data, it is requested again next cycle
+                    _LOGGER.warning(
+                        "Request for master data of '%s@%s' failed - OSError: %s",
+                        self.school,
+                        self.username,
+                        error,
+                    )
+                    # without a cached schoolyear there is no timetable window
+                    return self.current_schoolyear is not None
+
+                shared.update(master_data, now)
+                self._unavailable_master_data.update(
+                    (name, result)
+                    for name, result in master_data.items()
+                    if isinstance(result, Exception)
                 )
+            else:
+                _LOGGER.debug("Using the shared master data of '%s'", self.school)
+                master_data = {
+                    **self._unavailable_master_data,
+                    **self.session.restore_master_data(shared.data),
+                }
 
-            if self.calendar_homework_ids_setup:
-                for event in param_list:
-                    if event["homework_id"] not in self.calendar_homework_ids:
-                        self.calendar_homework_ids.append(event["homework_id"])
+        schoolyears = master_data["schoolyears"]
+        if isinstance(schoolyears, Exception):
+            _LOGGER.warning(
+                "Request for schoolyears of '%s@%s' failed - OSError: %s",
+                self.school,
+                self.username,
+                schoolyears,
+            )
+        else:
+            self.schoolyears = schoolyears
+            self.current_schoolyear = schoolyears.current
 
-                        self.homework_change_callback(
-                            "homework", {"homework_data": event}
-                        )
+            if not self.current_schoolyear:
+                # Login error, set all properties to unknown.
+                self.next_class = None
+                self.next_class_json = None
+                self.next_lesson_to_wake_up = None
+                self.calendar_events = []
+                self.calendar_homework = []
+                self.next_day_json = None
+                self.day_json = None
+                self.today = [None, None]
 
-                        for service in self.notify_config.values():
-                            if "homework" in service.get("options", []):
-                                data = {
-                                    "data": service.get("data", {}),
-                                    "target": service.get("target", {}),
-                                }
+                # Inform user once about failed update if necessary.
+                if not self._last_status_request_failed:
+                    _LOGGER.info(
+                        "No active schoolyear '%s@%s'",
+                        self.school,
+                        self.username,
+                    )
+                    _LOGGER.info(
+                        "Found schoolyears for '%s@%s': %s (%s)",
+                        self.school,
+                        self.username,
+                        self.schoolyears,
+                        self.current_schoolyear,
+                    )
+                self._last_status_request_failed = True
+                return False
 
-                                dic, notify_data = get_notification_data_homework(
-                                    event, service, self.title, self
-                                )
+        self.subjects = master_data["subjects"]
+        if isinstance(self.subjects, Exception):
+            _LOGGER.warning(
+                "Updating the subjects of '%s@%s' failed - OSError: %s",
+                self.school,
+                self.username,
+                self.subjects,
+            )
+            # the lazy lookups of the lessons must not request them again
+            self.subjects = self.session.clear_master_data("subjects")
 
-                                for key, value in notify_data.items():
-                                    data["data"][key] = value
+        self.klassen = master_data["klassen"]
+        if isinstance(self.klassen, Exception):
+            _LOGGER.warning(
+                "Updating the classes (klassen) of '%s@%s' failed - OSError: %s",
+                self.school,
+                self.username,
+                self.klassen,
+            )
+            # the lazy lookups of the lessons must not request them again
+            self.klassen = self.session.clear_master_data("klassen")
 
-                                data.update(dic)
+        if isinstance(master_data["rooms"], Exception):
+            _LOGGER.debug(
+                "No rooms for '%s@%s': %s",
+                self.school,
+                self.username,
+                master_data["rooms"],
+            )
+            self.session.clear_master_data("rooms")
 
-                                await async_notify(
-                                    self._hass,
-                                    service_id=service["entity_id"],
-                                    data=data,
-                                )
+        if isinstance(master_data.get("teachers"), Exception):
+            if "no right for getTeachers()" in str(master_data["teachers"]):
+                self.exclude_data_run.append("teachers")
+                self.exclude_data.append("teachers")
+            self.session.clear_master_data("teachers")
 
-            else:
-                self.calendar_homework_ids_setup = True
+        self._master_data_fetched = shared.fetched
 
-            self.calendar_homework_ids = []
-            for event in param_list:
-                self.calendar_homework_ids.append(event["homework_id"])
+        # the schoolyears may have failed before any were cached
+        return self.current_schoolyear is not None
 
+    async def _async_update_student_id(self) -> None:
         try:
-            self.today = await self._hass.async_add_executor_job(self._today)
+            self.student_id = await self.async_get_student_id()
         except OSError as error:
-            self.today = [None, None]
+            _LOGGER.warning(
+                "Updating the student_id of '%s@%s' failed - OSError: %s",
+                self.school,
+                self.username,
+                error,
+            )
+
+    async def _async_update_holidays(self) -> None:
+        """Fetch the holidays once per schoolyear."""
+        if self.current_schoolyear.id == self._holidays_schoolyear_id:
+            return
 
+        try:
+            holidays = await self.session.async_holidays()
+        except OSError as error:
             _LOGGER.warning(
-                "Updating the property today-sensor of '%s@%s' failed - OSError: %s",
+                "Updating the holidays of '%s@%s' failed - OSError: %s",
                 self.school,
                 self.username,
                 error,
             )
+            return
+
+        self.holidays = [
+            (holiday.start.date(), holiday.end.date()) for holiday in holidays
+        ]
+        self._holidays_schoolyear_id = self.current_schoolyear.id
+
+        await self._holiday_store.async_save(
+            {
+                "schoolyear_id": self._holidays_schoolyear_id,
+                "holidays": [
+                    {"start": start.isoformat(), "end": end.isoformat()}
+                    for start, end in self.holidays
+                ],
+            }
+        )
+
+    def _timetable_window(self, today: date) -> tuple[date, date]:
+        """Return the widest window of days needed by all sensors."""
+        start = max(
+            today - timedelta(days=today.weekday()),
+            self.current_schoolyear.start.date(),
+        )
+        end = min(
+            today + timedelta(days=DAYS_TO_FUTURE),
+            self.current_schoolyear.end.date(),
+        )
+        return start, end
+
+    async def _async_get_shared_timetable(self) -> SharedTimetable:
+        """
+        Return the shared timetable of the element, so entries that watch the
+        same element fetch it only once.
+        """
+        if self.timetable_source == "personal":
+            login_result = self.session.login_result
+            if "personId" not in login_result:
+                return self._shared_timetable
+            element = (login_result["personType"], login_result["personId"])
+        else:
+            try:
+                element_type, element_id = next(
+                    iter((await self.async_get_timetable_element()).items())
+                )
+            except OSError:
+                # the timetable request reports the error
+                return self._shared_timetable
+            element = (ELEMENT_TYPES[element_type], element_id)
+
+        key = (self.server.lower(), self.school.lower(), *element)
+        if key != self._shared_timetable_key:
+            self._shared_timetable = async_get_shared_timetable(self._hass, key)
+            self._shared_timetable_key = key
+            self._shared_timetable.merge(self._timetable_cache)
+
+        return self._shared_timetable
+
+    async def _async_update_timetable(self) -> bool:
+        """
+        Fetch the stale days of the timetable window and rebuild the snapshot.
+        Returns False if a range failed and its cached days were kept.
+
+        The days are fetched into the timetable shared by the entries of the
+        same element, the other entries take them over without a request.
+        """
+        today = date.today()
+        now = datetime.now()
+        start, end = self._timetable_window(today)
+        shared = await self._async_get_shared_timetable()
+
+        updated = True
+        async with shared.lock:
+            shared.evict(start, end)
+            ranges = shared.stale_ranges(start, end, now)
+            _LOGGER.debug("Fetching timetable days %s", ranges)
+
+            results = await asyncio.gather(
+                *(
+                    self.async_get_timetable(start=range_start, end=range_end)
+                    for range_start, range_end in ranges
+                ),
+                return_exceptions=True,
+            )
+            for (range_start, range_end), result in zip(ranges, results):
+                if isinstance(result, OSError):
+                    updated = False
+                    _LOGGER.warning(
+                        "Updating the timetable of '%s@%s' failed - OSError: %s",
+                        self.school,
+                        self.username,
+                        result,
+                    )
+                elif isinstance(result, BaseException):
+                    raise result
+                else:
+                    shared.update(range_start, range_end, raw_data(result), now)
+                    self._timetable_cache.update(range_start, range_end, result, now)
+
+        self._timetable_cache.evict(start, end)
+        self._timetable_cache.sync(shared, start, end, self.session)
+        self.timetable = self._timetable_cache.snapshot(start, end, today)
+        return updated
+
+    async def _async_update_exams(self) -> None:
+        if not self.has_homework or "exams" in self.exclude_data:
+            return
 
         try:
-            await self.update_notify()
+            self.calendar_exams = await async_return_exam_events(self, self._exam_cache)
         except OSError as error:
+            if "no right for" in str(error):
+                self.exclude_data_run.append("exams")
+                self.exclude_data.append("exams")
+            # keep the exams of the last update
             _LOGGER.warning(
-                "Updating lesson changes '%s@%s' failed - OSError: %s",
+                "Updating the property calendar_exams of '%s@%s' failed - OSError: %s",
                 self.school,
                 self.username,
                 error,
             )
 
-        await self._hass.async_add_executor_job(self.webuntis_logout)
+    async def _async_update_homework(self) -> list | None:
+        """Update the homework calendar, returns the homework parameters."""
+        if not self.has_homework or "homework" in self.exclude_data:
+            return None
+
+        try:
+            (
+                self.calendar_homework,
+                param_list,
+            ) = await async_return_homework_events(self, self._homework_cache)
+        except OSError as error:
+            if "no right for" in str(error):
+                self.exclude_data_run.append("homework")
+                self.exclude_data.append("homework")
+            # keep the homework of the last update
+            _LOGGER.warning(
+                "Updating the property calendar_homework of '%s@%s' failed - OSError: %s",
+                self.school,
+                self.username,
+                error,
+            )
+            return None
 
-    def webuntis_login(self):
+        return param_list
+
+    async def async_webuntis_login(self):
+        """
+        Lease the session, logging in if needed. Returns the login error, the
+        session is only leased without one and has to be returned with
+        async_webuntis_logout.
+        """
+        if self._parent is not None:
+            return await self._parent.async_webuntis_login()
+
+        # Login and logout never interleave, a lease can not lose its session.
+        async with self._session_lock:
+            error = await self._async_login()
+            if error is None:
+                self._session_leases += 1
+            return error
+
+    async def _async_login(self):
         if self._loged_in:
             # Check if there is a session id.
             if "jsessionid" not in self.session.config:
                 _LOGGER.debug("No session id found")
                 self._loged_in = False
             else:
-                # Check if session id is still valid.
-                try:
-                    self.session.schoolyears()
-                    self.updating += 1
-                    return None
-                except errors.NotLoggedInError:
-                    _LOGGER.debug("Session invalid")
-                    self._loged_in = False
+                # The session is used optimistically, requests log in again
+                # and retry once if it is not valid anymore.
+                if self.keep_logged_in:
+                    self._extend_session()
+                return None
 
         if not self._loged_in:
             # _LOGGER.debug("logging in")
 
             try:
-                self.session.login()
+                await self.session.async_login()
                 # _LOGGER.debug("Login successful")
-                self._loged_in = True
-                self.updating += 1
 
                 return None
             except OSError as error:
-                # Login error, set all properties to unknown.
-                self.next_class = None
-                self.next_class_json = None
-                self.next_lesson_to_wake_up = None
-                self.calendar_events = []
-                self.calendar_homework = []
-                self.calendar_exams = []
-                self.next_day_json = None
-                self.day_json = None
+                # Login error, the cached data is kept.
 
                 # Inform user once about failed update if necessary.
                 if not self._last_status_request_failed:
@@ -631,28 +1292,238 @@ class WebUntis:
                 self._last_status_request_failed = True
                 return error
 
-    def webuntis_logout(self):
-        self.updating -= 1
-        if not self.keep_logged_in and self.updating == 0:
-            self.session.logout()
+    async def async_webuntis_logout(self):
+        """Return a leased session, the last lease logs out if it expired."""
+        if self._parent is not None:
+            await self._parent.async_webuntis_logout()
+            return
+
+        async with self._session_lock:
+            self._session_leases -= 1
+            await self._async_logout()
+
+    async def _async_logout(self):
+        # The session is reused by the next cycles until it expires.
+        if (
+            self._loged_in
+            and not self.keep_logged_in
+            and self._session_leases == 0
+            and (
+                self._session_expires is None
+                or self._session_expires <= dt_util.utcnow()
+            )
+        ):
+            await self.session.async_logout(suppress_errors=True)
             # _LOGGER.debug("Logout successful")
             self._loged_in = False
+            await self._session_store.async_remove()
 
-    def get_student_id(self):
-        if self.timetable_source == "student":
-            student = self.session.get_student(
-                self.timetable_source_id[1], self.timetable_source_id[0]
+    async def async_load_session(self) -> None:
+        """Reuse the stored session of the last run if it has not expired."""
+        stored = await self._session_store.async_load()
+        if not stored:
+            return
+
+        expires = dt_util.parse_datetime(stored["expires"])
+        if expires is None or expires <= dt_util.utcnow():
+            return
+
+        self.session.config["jsessionid"] = stored["jsessionid"]
+        self.session.login_result = stored["login_result"]
+        self._session_expires = expires
+        self._loged_in = True
+
+        _LOGGER.debug("Reusing stored session of '%s@%s'", self.school, self.username)
+
+    async def _async_session_renewed(self) -> None:
+        """Called by the session after every login, also the ones of a retry."""
+        self._loged_in = True
+        await self._async_save_session()
+
+    async def async_load_caches(self) -> None:
+        """Load the holidays, exams and the data of the last update."""
+        if self.children:
+            for child in self.children:
+                await child.async_load_caches()
+            return
+
+        await self._exam_cache.async_load()
+
+        stored = await self._holiday_store.async_load()
+        if stored:
+            self.holidays = [
+                (
+                    date.fromisoformat(holiday["start"]),
+                    date.fromisoformat(holiday["end"]),
+                )
+                for holiday in stored["holidays"]
+            ]
+            self._holidays_schoolyear_id = stored["schoolyear_id"]
+
+        stored = await self._snapshot_store.async_load()
+        if stored:
+            try:
+                self._restore_snapshot(stored)
+            except (KeyError, TypeError, ValueError) as error:
+                _LOGGER.debug(
+                    "Stored data of '%s@%s' is not usable: %s",
+                    self.school,
+                    self.username,
+                    error,
+                )
+
+    @callback
+    def _snapshot_data(self) -> dict:
+        """Raw data of the last update, to warm start after a restart."""
+        return {
+            "saved": datetime.now().isoformat(),
+            "master_data": self.session.master_data_as_dict(),
+            "master_data_fetched": self._master_data_fetched.isoformat()
+            if self._master_data_fetched
+            else None,
+            "student_id": self.student_id,
+            "last_import_time": self.last_import_time,
+            "data_updated": self.data_updated.isoformat()
+            if self.data_updated
+            else None,
+            "timetable": self._timetable_cache.as_dict(),
+            "homework": self._homework_cache.as_dict(),
+        }
+
+    def _restore_snapshot(self, stored: dict) -> None:
+        """Restore the data of the last update, so entities have a state at once."""
+        master_data = self.session.restore_master_data(stored["master_data"])
+        self.schoolyears = master_data.get("schoolyears")
+        self.current_schoolyear = self.schoolyears.current if self.schoolyears else None
+        if not self.current_schoolyear:
+            return
+
+        # lists that were not available are cached empty, so the lazy lookups
+        # of the lessons do not request them
+        for name in MASTER_DATA_LISTS:
+            if name not in master_data:
+                master_data[name] = self.session.clear_master_data(name)
+        self.subjects = master_data["subjects"]
+        self.klassen = master_data["klassen"]
+        if stored["master_data_fetched"]:
+            self._master_data_fetched = datetime.fromisoformat(
+                stored["master_data_fetched"]
             )
-            return student.id
+            self._shared_master_data.restore(
+                stored["master_data"], self._master_data_fetched
+            )
+        self.student_id = stored["student_id"]
+        if stored.get("data_updated"):
+            self.data_updated = datetime.fromisoformat(stored["data_updated"])
 
-    def get_timetable(self, start, end: datetime, sort=False):
-        """Get the timetable for the given time period"""
-        timetable_object = None
-        if self.timetable_source != "personal":
-            timetable_object = get_timetable_object(
-                self.timetable_source_id, self.timetable_source, self.session
+        today = date.today()
+        # the timetable window moves with the day
+        if datetime.fromisoformat(stored["saved"]).date() == today:
+            self.last_import_time = stored["last_import_time"]
+
+        self._timetable_cache.restore(stored["timetable"], self.session)
+        self.timetable = self._timetable_cache.snapshot(
+            *self._timetable_window(today), today
+        )
+
+        if self.has_homework:
+            self._homework_cache.restore(stored["homework"])
+            self.calendar_homework, _ = return_cached_homework_events(
+                self, self._homework_cache
             )
+            self.calendar_exams = return_cached_exam_events(self, self._exam_cache)
+
+        self._update_properties()
+
+        _LOGGER.debug(
+            "Restored %s lessons of '%s@%s' from %s",
+            len(self.timetable) if self.timetable else 0,
+            self.school,
+            self.username,
+            stored["saved"],
+        )
+
+    async def _async_save_session(self) -> None:
+        """Store a new session, its lifetime starts now."""
+        self._session_expires = dt_util.utcnow() + timedelta(seconds=SESSION_LIFETIME)
+
+        await self._session_store.async_save(self._session_data())
+
+    @callback
+    def _extend_session(self) -> None:
+        """
+        Extend the lifetime of the used session. Only its expiry changes, so
+        it is stored delayed and not in every update.
+        """
+        self._session_expires = dt_util.utcnow() + timedelta(seconds=SESSION_LIFETIME)
+
+        self._session_store.async_delay_save(self._session_data, SESSION_SAVE_DELAY)
+
+    def _session_data(self) -> dict:
+        """Return the session for the store."""
+        return {
+            "jsessionid": self.session.config["jsessionid"],
+            "login_result": self.session.login_result,
+            "expires": self._session_expires.isoformat(),
+        }
+
+    def config_changed(self, entry: ConfigEntry) -> bool:
+        """Check if the entry changed since setup, apart from cached data."""
+        return (
+            _without_cached_data(entry.data) != self._config_data
+            or dict(entry.options) != self._config_options
+        )
 
+    async def async_get_student_id(self):
+        if self.timetable_source == "student":
+            element = await self.async_get_timetable_element()
+            return element["student"]
+
+    async def async_get_timetable_element(self, resolve=False) -> dict:
+        """
+        Return the element type and id of the timetable. It is resolved once
+        and stored in the entry data, resolve forces to look it up again.
+        """
+        if self._child is not None:
+            # the parent account lists the children with their id
+            return {"student": self._child["id"]}
+
+        element = self._config.data.get("timetable_element")
+        if (
+            not resolve
+            and element is not None
+            and element["source_id"] == self.timetable_source_id
+        ):
+            return {element["type"]: element["id"]}
+
+        timetable_object = await async_get_timetable_object(
+            self.timetable_source_id, self.timetable_source, self.session
+        )
+        source = timetable_object.get(self.timetable_source)
+        if source is None:
+            # e.g. a parent account without children has no timetable
+            raise errors.RemoteError(
+                f"No {self.timetable_source} timetable for '{self.timetable_source_id}'"
+            )
+        element = {
+            "type": self.timetable_source,
+            "id": source.id,
+            "source_id": self.timetable_source_id,
+        }
+        self._hass.config_entries.async_update_entry(
+            self._config, data={**self._config.data, "timetable_element": element}
+        )
+        _LOGGER.debug(
+            "Resolved timetable element of '%s@%s': %s",
+            self.school,
+            self.username,
+            element,
+        )
+
+        return {element["type"]: element["id"]}
+
+    async def async_get_timetable(self, start, end: datetime, sort=False):
+        """Get the timetable for the given time period"""
         if not self.current_schoolyear:
             _LOGGER.warning(
                 "No valid school year found for start date %s. Returning empty timetable.",
@@ -668,23 +1539,49 @@ class WebUntis:
 
         result = []
         if self.timetable_source == "personal":
-            result = self.session.my_timetable(start=start, end=end)
+            result = await self.session.async_my_timetable(start=start, end=end)
         else:
-            result = self.session.timetable_extended(
-                start=start, end=end, **timetable_object
-            )
+            element = await self.async_get_timetable_element()
+            try:
+                result = await self.session.async_timetable_extended(
+                    start=start, end=end, **element
+                )
+            except errors.AuthError:
+                raise
+            except errors.RemoteError:
+                # the stored element may be outdated, look it up again once
+                resolved = await self.async_get_timetable_element(resolve=True)
+                if resolved == element:
+                    raise
+                result = await self.session.async_timetable_extended(
+                    start=start, end=end, **resolved
+                )
 
         if sort:
             result = sorted(result, key=lambda x: x.start)
 
         return result
 
+    def get_lessons(self, start, end):
+        """Get the lessons for the given days from the timetable snapshot"""
+        if self.timetable is None:
+            return []
+
+        return self.timetable.get_lessons(start, end)
+
+    async def async_get_lessons(self, start, end, sort=False):
+        """Get the lessons for the given days, from the snapshot if it covers them"""
+        if self.timetable is not None and self.timetable.covers(start, end):
+            return self.timetable.get_lessons(start, end)
+
+        return await self.async_get_timetable(start=start, end=end, sort=sort)
+
     def _next_class(self):
         """returns time of next class."""
         today = date.today()
         in_x_days = today + timedelta(days=DAYS_TO_FUTURE)
 
-        table = self.get_timetable(start=today, end=in_x_days)
+        table = self.get_lessons(start=today, end=in_x_days)
 
         now = datetime.now()
 
@@ -719,7 +1616,7 @@ class WebUntis:
         now = datetime.now()
         in_x_days = today + timedelta(days=DAYS_TO_FUTURE)
 
-        table = self.get_timetable(start=today, end=in_x_days)
+        table = self.get_lessons(start=today, end=in_x_days)
 
         time_list = []
         for lesson in table:
@@ -758,7 +1655,7 @@ class WebUntis:
             return "JSON data is disabled - activate it in the options"
         day = self.next_lesson_to_wake_up.date()
 
-        table = self.get_timetable(start=day, end=day, sort=True)
+        table = self.get_lessons(start=day, end=day)
 
         lessons = []
         for lesson in table:
@@ -776,7 +1673,7 @@ class WebUntis:
             return "JSON data is disabled - activate it in the options"
         day = date.today()
 
-        table = self.get_timetable(start=day, end=day, sort=True)
+        table = self.get_lessons(start=day, end=day)
 
         lessons = []
         for lesson in table:
@@ -788,18 +1685,7 @@ class WebUntis:
         return json_str
 
     def _get_events(self):
-        today = date.today()
-        in_x_days = today + timedelta(days=DAYS_TO_FUTURE)
-        # Get the current school year for today
-        if self.current_schoolyear:
-            # Use the later of week_start and schoolyear.start.date()
-            week_start = max(
-                today - timedelta(days=today.weekday()),
-                self.current_schoolyear.start.date(),
-            )
-        else:
-            week_start = today - timedelta(days=today.weekday())
-        table = self.get_timetable(start=week_start, end=in_x_days)
+        table = self.timetable.lessons if self.timetable is not None else []
 
         event_list = []
         self.event_list = []
@@ -878,7 +1764,7 @@ class WebUntis:
 
         return event_list
 
-    def _get_events_in_timerange(
+    async def _async_get_events_in_timerange(
         self,
         start,
         end,
@@ -887,7 +1773,7 @@ class WebUntis:
         compact_result=True,
         compact_tolerance_minutes=0,
     ):
-        table = self.get_timetable(start=start.date(), end=end.date())
+        table = await self.async_get_lessons(start=start.date(), end=end.date())
 
         events = []
 
@@ -908,8 +1794,8 @@ class WebUntis:
 
         return events
 
-    def _count_lessons(self, start, end, filter_on, count_cancelled=False):
-        table = self.get_timetable(start=start.date(), end=end.date())
+    async def _async_count_lessons(self, start, end, filter_on, count_cancelled=False):
+        table = await self.async_get_lessons(start=start.date(), end=end.date())
 
         result = {}
 
@@ -955,7 +1841,7 @@ class WebUntis:
     def _today(self):
         today = date.today()
 
-        table = self.get_timetable(start=today, end=today)
+        table = self.get_lessons(start=today, end=today)
 
         time_list_start = []
         for lesson in table:
@@ -1216,11 +2102,15 @@ class WebUntis:
 
         self.exclude_data_run.remove(data)
 
-        new_options = {**self._config.options}
-        new_options["exclude_data"] = [*new_options["exclude_data"], data]
-
-        self._hass.config_entries.async_update_entry(self._config, options=new_options)
-        self.exclude_data.append(data)
+        exclude_data = list(self._config.options["exclude_data"])
+        if data not in exclude_data:
+            # the children of a parent account share the options
+            self._hass.config_entries.async_update_entry(
+                self._config,
+                options={**self._config.options, "exclude_data": [*exclude_data, data]},
+            )
+        if data not in self.exclude_data:
+            self.exclude_data.append(data)
 
         _LOGGER.info(
             "No rights for %s, is now on blacklist '%s@%s'",
@@ -1317,7 +2207,7 @@ class WebUntisEntity(Entity):
             identifiers={(DOMAIN, self._server.unique_id)},
             manufacturer="Web Untis",
             model=f"{self._server.school}@{self._server.username}",
-            name=self._server.username,
+            name=self._server.device_name,
         )
         self._attr_device_class = device_class
         self._extra_state_attributes = None
@@ -28,11 +28,13 @@ async def async_setup_entry(
     """Set up the Web Untis calendar platform."""
     server = hass.data[DOMAIN][config_entry.unique_id]
 
-    entities = [UntisCalendar(server)]
+    entities = []
+    for view in server.views:
+        entities.append(UntisCalendar(view))
 
-    if server.timetable_source != "teacher":
-        entities.append(HomeworkCalendar(server))
-        entities.append(ExamCalendar(server))
+        if view.has_homework:
+            entities.append(HomeworkCalendar(view))
+            entities.append(ExamCalendar(view))
 
     # Add calendar entities.
     async_add_entities(entities, True)
@@ -60,6 +62,11 @@ class BaseUntisCalendar(WebUntisEntity, CalendarEntity):
         """Return the next upcoming event."""
         return self._event
 
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the time the data was last confirmed to be current."""
+        return {"data_updated": self._server.data_updated}
+
     async def async_get_events(
         self,
         hass: HomeAssistant,
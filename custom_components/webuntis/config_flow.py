@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import datetime
 import logging
 import socket
@@ -26,12 +27,16 @@ from .const import (
     DEFAULT_OPTIONS,
     DOMAIN,
     NOTIFY_OPTIONS,
+    OPTIONS_REFRESH_TIMEOUT,
     TEMPLATE_OPTIONS,
 )
 from .notify import get_notification_data
 from .utils.errors import *
+from .utils.executor import async_add_webuntis_job
+from .utils.rate_limit import async_get_rate_limiter
 from .utils.utils import async_notify, is_service
 from .utils.web_untis import get_timetable_object
+from .utils.web_untis_extended import ExtendedSession
 
 # import webuntis.session
 
@@ -99,7 +104,13 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             if user_input["timetable_source"] == "personal":
                 self._user_input_temp.update(user_input)
                 self._user_input_temp.update({"timetable_source_id": "personal"})
-                errors = await self.hass.async_add_executor_job(self.test_timetable)
+                errors = await async_add_webuntis_job(self.hass, self.test_timetable)
+                if not errors:
+                    return await self.create_entry()
+            elif user_input["timetable_source"] == "parent":
+                # one entry with a device per child of the parent account
+                self._user_input_temp.update({"timetable_source_id": "parent"})
+                errors = await async_add_webuntis_job(self.hass, self.test_timetable)
                 if not errors:
                     return await self.create_entry()
             elif user_input["timetable_source"] == "student":
@@ -109,12 +120,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return await self.async_step_pick_teacher()
 
             elif user_input["timetable_source"] == "klasse":
-                schoolyears = await self.hass.async_add_executor_job(
-                    self._session_temp.schoolyears
+                schoolyears = await async_add_webuntis_job(
+                    self.hass,
+                    self._session_temp.schoolyears,
                 )
 
-                current_schoolyear = await self.hass.async_add_executor_job(
-                    lambda: schoolyears.current
+                current_schoolyear = await async_add_webuntis_job(
+                    self.hass,
+                    lambda: schoolyears.current,
                 )
                 if current_schoolyear:
                     return await self.async_step_pick_klasse()
@@ -132,6 +145,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         selector.SelectSelectorConfig(
                             options=[
                                 "personal",
+                                "parent",
                                 "student",
                                 "klasse",
                                 "teacher",
@@ -161,7 +175,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 }
             )
 
-            errors = await self.hass.async_add_executor_job(self.test_timetable)
+            errors = await async_add_webuntis_job(self.hass, self.test_timetable)
             if not errors:
                 return await self.create_entry()
         else:
@@ -198,7 +212,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     ],
                 }
             )
-            errors = await self.hass.async_add_executor_job(self.test_timetable)
+            errors = await async_add_webuntis_job(self.hass, self.test_timetable)
             if not errors:
                 return await self.create_entry()
         else:
@@ -229,8 +243,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             if not user_input.get("klasse"):
                 errors = {"base": "class_not_found"}
             else:
-                klassen = await self.hass.async_add_executor_job(
-                    self._session_temp.klassen
+                klassen = await async_add_webuntis_job(
+                    self.hass,
+                    self._session_temp.klassen,
                 )
                 try:
                     source = klassen.filter(name=user_input["klasse"])[0]
@@ -243,7 +258,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         "timetable_source_id": user_input["klasse"],
                     }
                 )
-                errors = await self.hass.async_add_executor_job(self.test_timetable)
+                errors = await async_add_webuntis_job(self.hass, self.test_timetable)
             if not errors:
                 return await self.create_entry()
         else:
@@ -336,14 +351,16 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return errors, None
 
         try:
-            session = webuntis.Session(
+            # the extended session can also list the children of a parent account
+            session = ExtendedSession(
                 server=credentials["server"],
                 school=credentials["school"],
                 username=credentials["username"],
                 password=credentials["password"],
                 useragent="home-assistant",
+                rate_limiter=async_get_rate_limiter(hass, credentials["server"]),
             )
-            await hass.async_add_executor_job(session.login)
+            await async_add_webuntis_job(hass, session.login)
         except webuntis.errors.BadCredentialsError:
             errors["username"] = "bad_credentials"
         except requests.exceptions.ConnectionError as exc:
@@ -374,6 +391,16 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             if user_input["timetable_source"] == "personal":
                 session.my_timetable(start=day, end=day)
                 self._source_id = session.login_result["personId"]
+                user_input.pop("timetable_element", None)
+            elif user_input["timetable_source"] == "parent":
+                children = session.get_children()
+                if not children:
+                    return {"base": "no_children"}
+                session.timetable(start=day, end=day, student=children[0]["id"])
+                # the same login may also have a personal entry
+                self._source_id = f"parent-{session.login_result['personId']}"
+                user_input["children"] = children
+                user_input.pop("timetable_element", None)
             else:
                 timetable_object = get_timetable_object(
                     user_input["timetable_source_id"],
@@ -386,6 +413,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     **timetable_object,
                 )
                 self._source_id = timetable_object[user_input["timetable_source"]].id
+                # resolved once, the integration reuses it from the entry data
+                user_input["timetable_element"] = {
+                    "type": user_input["timetable_source"],
+                    "id": self._source_id,
+                    "source_id": user_input["timetable_source_id"],
+                }
 
         except Exception as exc:
             if str(exc) == "'Student not found'":
@@ -426,6 +459,31 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         """Manage the options."""
         return self.async_show_menu(step_id="init", menu_options=OPTIONS_MENU)
 
+    async def _async_get_server(self):
+        """
+        Return the server with refreshed subjects and klassen, None if the
+        entry is not loaded. If the refresh fails or takes too long, the
+        cached master data is used.
+        """
+        server = self.hass.data.get(DOMAIN, {}).get(self._config_entry.unique_id)
+        if server is None:
+            return None
+
+        # the children of a parent account go to the same school
+        server = server.views[0]
+        try:
+            await asyncio.wait_for(
+                server.async_refresh_master_data(), OPTIONS_REFRESH_TIMEOUT
+            )
+        except TimeoutError:
+            _LOGGER.warning("Refreshing the master data for the options timed out")
+        except OSError as error:
+            _LOGGER.warning(
+                "Refreshing the master data for the options failed - OSError: %s",
+                error,
+            )
+        return server
+
     async def save(self, user_input):
         """Save the options"""
         _LOGGER.debug("Saving options: %s", user_input)
@@ -460,7 +518,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
             return await self.save(user_input)
 
-        server = self.hass.data[DOMAIN][self._config_entry.unique_id]
+        server = await self._async_get_server()
 
         return self.async_show_form(
             step_id="filter",
@@ -484,7 +542,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         default=self._config_entry.options.get("filter_subjects", []),
                     ): selector.SelectSelector(
                         selector.SelectSelectorConfig(
-                            options=_create_subject_list(server),
+                            options=_create_subject_list(
+                                server,
+                                self._config_entry.options.get("filter_subjects", []),
+                            ),
                             multiple=True,
                             mode=selector.SelectSelectorMode.DROPDOWN,
                         ),
@@ -494,7 +555,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         default=self._config_entry.options.get("filter_klassen", []),
                     ): selector.SelectSelector(
                         selector.SelectSelectorConfig(
-                            options=_create_klasse_list(server),
+                            options=_create_klasse_list(
+                                server,
+                                self._config_entry.options.get("filter_klassen", []),
+                            ),
                             multiple=True,
                             mode=selector.SelectSelectorMode.DROPDOWN,
                         ),
@@ -621,7 +685,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             else:
                 return await self.save(user_input)
 
-        server = self.hass.data[DOMAIN][self._config_entry.unique_id]
+        server = await self._async_get_server()
 
         return self.async_show_form(
             step_id="lesson",
@@ -647,7 +711,12 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         ),
                     ): selector.SelectSelector(
                         selector.SelectSelectorConfig(
-                            options=_create_subject_list(server),
+                            options=_create_subject_list(
+                                server,
+                                self._config_entry.options.get(
+                                    "lesson_add_teacher", []
+                                ),
+                            ),
                             multiple=True,
                             mode=selector.SelectSelectorMode.DROPDOWN,
                         ),
@@ -694,7 +763,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         default=self._config_entry.options.get("exclude_data"),
                     ): selector.SelectSelector(
                         selector.SelectSelectorConfig(
-                            options=["teachers"],
+                            options=["teachers", "homework", "exams"],
                             multiple=True,
                             mode=selector.SelectSelectorMode.DROPDOWN,
                         ),
@@ -921,19 +990,18 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         )
 
 
-def _create_subject_list(server):
-    """Create a list of subjects."""
-
-    subjects = server.subjects
+def _create_subject_list(server, selected=()):
+    """Create a list of subjects, the selected ones are always included."""
+    subjects = [subject.name for subject in server.subjects] if server else []
 
-    return [subject.name for subject in subjects]
+    return subjects + [name for name in selected if name not in subjects]
 
 
-def _create_klasse_list(server):
-    """Create a list of classes/ klassen"""
+def _create_klasse_list(server, selected=()):
+    """Create a list of classes/ klassen, the selected ones are always included."""
     try:
-        klassen = server.klassen
+        klassen = [klasse.name for klasse in server.klassen] if server else []
     except Exception:
-        return []
+        klassen = []
 
-    return [klasse.name for klasse in klassen]
+    return klassen + [name for name in selected if name not in klassen]
@@ -60,9 +60,52 @@ NAME_EVENT_HOMEWORK = "new_homework"
 
 SCAN_INTERVAL = 10 * 60  # 10min
 
+# Adaptive polling, see utils/scheduler.py
+SCAN_INTERVAL_LEAD = 5 * 60  # 5min, in the hour before the first lesson
+SCAN_INTERVAL_IDLE = 60 * 60  # 1h, outside of school hours
+SCHOOL_DAY_LEAD = 60 * 60  # 1h
+HOLIDAY_HEARTBEAT = 6 * 60 * 60  # 6h, in holidays and between schoolyears
+UPDATE_SLOW_DURATION = 2 * 60  # an update taking longer backs off the polling
+UPDATE_BACKOFF_MAX = 60 * 60  # 1h, longest interval of a slow server
+MAX_CONCURRENT_UPDATES = 2  # entries updating at the same time
+
+REQUEST_TIMEOUT = 30  # seconds per request
+OPTIONS_REFRESH_TIMEOUT = 10  # seconds the options flow waits for fresh master data
+MAX_CONCURRENT_REQUESTS = 4  # per session
+EXECUTOR_MAX_WORKERS = 4  # threads for blocking webuntis library calls
+
+# Requests per second to one server, adapted to the rate it accepts, see utils/rate_limit.py
+RATE_LIMIT_START = 5
+RATE_LIMIT_MIN = 0.5
+RATE_LIMIT_MAX = 20
+RATE_LIMIT_BURST = 10  # requests sent at once after an idle time
+
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 5 * 60  # the data of the last update is stored at most every 5min
+
+# Subjects, klassen, rooms and teachers are refreshed after this time, or on day change
+MASTER_DATA_TTL = 12 * 60 * 60  # 12h
+
+# Sessions are reused for this time, or until WebUntis rejects them
+SESSION_LIFETIME = 60 * 60  # 1h
+# a session that is only used again is stored at most every 15min
+SESSION_SAVE_DELAY = 15 * 60
+
 SIGNAL_NAME_PREFIX = f"signal_{DOMAIN}"
 
 DAYS_TO_FUTURE = 30
 
+# (first day, last day, max age) relative to today, other days use the last tier
+TIMETABLE_TIERS = (
+    (0, 1, 0),  # today and tomorrow, every cycle
+    (2, 7, 60 * 60),  # rest of the week, hourly
+    (8, DAYS_TO_FUTURE, 6 * 60 * 60),  # a few times a day
+)
+# a timetable fetch of another entry of the same element is reused in the same
+# slot, these entries share their update phase
+SHARED_TIMETABLE_REUSE = 60  # seconds
+
 # Homework
 DAYS_TO_CHECK = 30
+# days around today that are fetched again every cycle
+HOMEWORK_REFRESH_DAYS = 7
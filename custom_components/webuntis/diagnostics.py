@@ -0,0 +1,35 @@
+"""Diagnostics support for WebUntis."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .utils.executor import async_get_executor
+
+TO_REDACT = {"username", "password"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    server = hass.data[DOMAIN][entry.unique_id]
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "data_age": {view.unique_id: view.data_age for view in server.views},
+        # duration of the update cycles and the backoff of a slow server
+        "update": server.update_stats,
+        # the thread pool of the blocking library calls, shared by all entries
+        "executor": async_get_executor(hass).stats,
+        # the rate limiter of the server, shared by its entries
+        "rate_limiter": server.session.rate_limiter.stats,
+    }
@@ -22,9 +22,11 @@ async def async_setup_entry(
 ) -> None:
     """Set up Example sensor based on a config entry."""
     server = hass.data[DOMAIN][config_entry.unique_id]
-    entities = [LessonChangeEventEntity(server)]
-    if server.timetable_source != "teacher":
-        entities.append(HomeworkEventEntity(server))
+    entities = []
+    for view in server.views:
+        entities.append(LessonChangeEventEntity(view))
+        if view.has_homework:
+            entities.append(HomeworkEventEntity(view))
     async_add_entities(
         entities,
         True,
@@ -31,13 +31,15 @@ async def async_setup_entry(
     """Set up the Web Untis sensor platform."""
     server = hass.data[DOMAIN][config_entry.unique_id]
 
-    # Create entities list.
-    entities = [
-        WebUntisNextClassSensor(server),
-        WebUntisNextLessonToWakeUpSensor(server),
-        WebUntisToayStart(server),
-        WebUntisToayEnd(server),
-    ]
+    # Create entities list, a parent account has a device per child.
+    entities = []
+    for view in server.views:
+        entities += [
+            WebUntisNextClassSensor(view),
+            WebUntisNextLessonToWakeUpSensor(view),
+            WebUntisToayStart(view),
+            WebUntisToayEnd(view),
+        ]
 
     # Add sensor entities.
     async_add_entities(entities, True)
@@ -60,6 +62,13 @@ class WebUntisSensorEntity(WebUntisEntity, SensorEntity):
         super().__init__(server, name, icon, device_class)
         self._attr_native_unit_of_measurement = self.unit
 
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Return the state attributes and the time the data was last current."""
+        attributes = dict(self._attr_extra_state_attributes or {})
+        attributes["data_updated"] = self._server.data_updated
+        return attributes
+
     @property
     def available(self) -> bool:
         """Return sensor availability."""
@@ -7,6 +7,7 @@ from datetime import datetime
 
 from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.service import async_extract_config_entry_ids
 
 from .const import DOMAIN
@@ -25,10 +26,24 @@ async def async_setup_services(hass: HomeAssistant) -> None:
 
         entry_id = await async_extract_config_entry_ids(service_call)
         config_entry = hass.config_entries.async_get_entry(list(entry_id)[0])
-        webuntis_object = hass.data[DOMAIN][config_entry.unique_id]
+        server = hass.data[DOMAIN][config_entry.unique_id]
 
         data = service_call.data
 
+        # A parent account has a device per child.
+        device = dr.async_get(hass).async_get(data.get("device_id"))
+        identifiers = set()
+        if device is not None:
+            identifiers = {
+                identifier
+                for domain, identifier in device.identifiers
+                if domain == DOMAIN
+            }
+        webuntis_object = next(
+            (view for view in server.views if view.unique_id in identifiers),
+            server.views[0],
+        )
+
         if "start" in data and "end" in data:
             start_date = datetime.strptime(data["start"], "%Y-%m-%d")
             end_date = datetime.strptime(data["end"], "%Y-%m-%d")
@@ -36,35 +51,37 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             if end_date < start_date:
                 raise HomeAssistantError(f"Start date has to be before end date")
 
-        await hass.async_add_executor_job(webuntis_object.webuntis_login)
+        if await webuntis_object.async_webuntis_login():
+            raise HomeAssistantError("Login to WebUntis failed")
 
         result = None
 
-        if service_call.service == "get_timetable":
-            lesson_list = await hass.async_add_executor_job(
-                webuntis_object._get_events_in_timerange,
-                start_date,
-                end_date,
-                data["apply_filter"],
-                data["show_cancelled"],
-                data["compact_result"],
-                data.get("compact_tolerance_minutes", 0),
-            )
-            result = {"lessons": lesson_list}
-
-        elif service_call.service == "count_lessons":
-            result = await hass.async_add_executor_job(
-                webuntis_object._count_lessons,
-                start_date,
-                end_date,
-                data["apply_filter"],
-                data["count_cancelled"],
-            )
-
-        elif service_call.service == "get_schoolyears":
-            result = await hass.async_add_executor_job(webuntis_object._get_schoolyears)
-
-        await hass.async_add_executor_job(webuntis_object.webuntis_logout)
+        # The session is shared with the periodic update, identical requests
+        # in flight are sent only once.
+        try:
+            if service_call.service == "get_timetable":
+                lesson_list = await webuntis_object._async_get_events_in_timerange(
+                    start_date,
+                    end_date,
+                    data["apply_filter"],
+                    data["show_cancelled"],
+                    data["compact_result"],
+                    data.get("compact_tolerance_minutes", 0),
+                )
+                result = {"lessons": lesson_list}
+
+            elif service_call.service == "count_lessons":
+                result = await webuntis_object._async_count_lessons(
+                    start_date,
+                    end_date,
+                    data["apply_filter"],
+                    data["count_cancelled"],
+                )
+
+            elif service_call.service == "get_schoolyears":
+                result = webuntis_object._get_schoolyears()
+        finally:
+            await webuntis_object.async_webuntis_logout()
 
         return result
 
@@ -1,13 +1,63 @@
 import uuid
+from datetime import date
 from webuntis import errors
 from homeassistant.components.calendar import CalendarEvent
-from webuntis.utils.datetime_utils import parse_datetime
+from webuntis.utils.datetime_utils import format_date, parse_datetime
 
 
 # pylint: disable=relative-beyond-top-level
 from ..utils.web_untis import get_lesson_name_str
 
 
+class ExamCache:
+    """
+    Raw exams of one schoolyear with a persistent store. Past exams are
+    fetched once, afterwards only the exams from today on are refreshed.
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self.schoolyear_id = None
+        self.exams = []
+        # exam id: (raw exam, CalendarEvent), reused while the exam is unchanged
+        self.events = {}
+
+    async def async_load(self):
+        """Load the exams stored in the last run."""
+        stored = await self._store.async_load()
+        if stored:
+            self.schoolyear_id = stored["schoolyear_id"]
+            self.exams = stored["exams"]
+
+    def fetch_range(self, schoolyear, today):
+        """Return the date range that has to be fetched, None if there is none"""
+        start = schoolyear.start.date()
+        end = schoolyear.end.date()
+        if schoolyear.id == self.schoolyear_id:
+            start = max(start, today)
+        if start > end:
+            return None
+        return start, end
+
+    async def async_update(self, schoolyear_id, start, exams):
+        """Replace the cached exams from start on with fetched ones."""
+        if schoolyear_id != self.schoolyear_id:
+            kept = []
+        else:
+            start = format_date(start)
+            kept = [exam for exam in self.exams if exam.get("examDate", 0) < start]
+
+        exams = kept + exams
+        if schoolyear_id == self.schoolyear_id and exams == self.exams:
+            return
+
+        self.schoolyear_id = schoolyear_id
+        self.exams = exams
+        await self._store.async_save(
+            {"schoolyear_id": self.schoolyear_id, "exams": self.exams}
+        )
+
+
 class ExamEventsFetcher:
     def __init__(self, server, timezone_str="UTC"):
         self.server = server
@@ -35,29 +85,61 @@ class ExamEventsFetcher:
         exam_events = self._process_exam_data(exam_data)
         return exam_events
 
+    async def _async_get_exam_events(self, cache):
+        """
+        Async version of _get_exam_events, running on the event loop. Only
+        the range of the schoolyear that is not cached yet is fetched.
+        """
+        fetch_range = cache.fetch_range(self.current_schoolyear, date.today())
+
+        if fetch_range is not None:
+            start, end = fetch_range
+
+            # Fetch exam data using the session object, errors are passed on
+            # as OSError so the cached exams are kept
+            exam_data = await self.session.async_get_exams(start=start, end=end)
+
+            await cache.async_update(
+                self.current_schoolyear.id,
+                start,
+                exam_data.get("data", {}).get("exams", []),
+            )
+
+        # Process the cached exams and extract exam events
+        return self._process_exams(cache.exams, cache.events)
+
     def _process_exam_data(self, response_data):
         """
         Process the exam response data and return a list of event dictionaries.
         """
         exams = response_data.get("data", {}).get("exams", [])
 
+        return self._process_exams(exams, {})
+
+    def _process_exams(self, exams, events):
+        """
+        Create a CalendarEvent object for every exam of the student. Events in
+        events, keyed by exam id, are reused while their exam is unchanged.
+        """
         event_list = []
+        reused_events = {}
 
         # Process each exam entry and create a CalendarEvent object
         for exam in exams:
             exam_id = exam.get("id", None)
+
+            if exam_id in events and events[exam_id][0] == exam:
+                reused_events[exam_id] = events[exam_id]
+                if self._is_assigned(exam):
+                    event_list.append(events[exam_id][1])
+                continue
+
             exam_type = exam.get("examType", "Unknown Type")
             name = exam.get("name", "No Name")
             subject = exam.get("subject", "Unknown Subject")
             text = exam.get("text", "")
             grade = exam.get("grade", "")
 
-            assigned_students = exam.get("assignedStudents", [])
-            if assigned_students:  # Checks if the list is not empty
-                student_id = assigned_students[0].get("id", None)
-            else:
-                student_id = None
-
             # Parse dates and times for the exam
             exam_date = exam.get("examDate")
             start_time = exam.get("startTime", 0)
@@ -82,20 +164,36 @@ class ExamEventsFetcher:
                 description += f" Text: \n{text}"
 
             # Create a structured CalendarEvent object with timezone-aware datetimes
-            event = {
-                "uid": str(uuid.uuid4()),
-                "summary": summary,
-                "start": start_datetime,
-                "end": end_datetime,
-                "description": description,
-                "location": rooms,
-            }
-
-            if self.server.student_id is None or self.server.student_id == student_id:
-                event_list.append(CalendarEvent(**event))
+            event = CalendarEvent(
+                # stable uid, the exam id is unique within the school
+                uid=str(exam_id) if exam_id is not None else str(uuid.uuid4()),
+                summary=summary,
+                start=start_datetime,
+                end=end_datetime,
+                description=description,
+                location=rooms,
+            )
+
+            if exam_id is not None:
+                reused_events[exam_id] = (exam, event)
+
+            if self._is_assigned(exam):
+                event_list.append(event)
+
+        events.clear()
+        events.update(reused_events)
 
         return event_list
 
+    def _is_assigned(self, exam):
+        """Check if the exam belongs to the student of the server"""
+        if self.server.student_id is None:
+            return True
+
+        assigned_students = exam.get("assignedStudents", [])
+        student_id = assigned_students[0].get("id", None) if assigned_students else None
+        return self.server.student_id == student_id
+
 
 # Example usage:
 def return_exam_events(server, timezone_str="UTC"):
@@ -104,3 +202,19 @@ def return_exam_events(server, timezone_str="UTC"):
     """
     fetcher = ExamEventsFetcher(server, timezone_str=timezone_str)
     return fetcher._get_exam_events()
+
+
+async def async_return_exam_events(server, cache, timezone_str="UTC"):
+    """
+    Async version of return_exam_events, keeping the exams in cache.
+    """
+    fetcher = ExamEventsFetcher(server, timezone_str=timezone_str)
+    return await fetcher._async_get_exam_events(cache)
+
+
+def return_cached_exam_events(server, cache, timezone_str="UTC"):
+    """
+    Return the exam events of cache without fetching them.
+    """
+    fetcher = ExamEventsFetcher(server, timezone_str=timezone_str)
+    return fetcher._process_exams(cache.exams, cache.events)
@@ -0,0 +1,120 @@
+"""Dedicated executor for the blocking calls of the webuntis library"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+
+from ..const import DOMAIN, EXECUTOR_MAX_WORKERS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WebUntisExecutor:
+    """
+    Bounded thread pool of the integration. A hanging WebUntis server only
+    blocks these threads instead of the shared executor of Home Assistant.
+    """
+
+    def __init__(self, max_workers: int = EXECUTOR_MAX_WORKERS) -> None:
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=DOMAIN
+        )
+
+        # metrics
+        self.queued = 0
+        self.running = 0
+        self.last_wait = 0.0
+        self.last_runtime = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def stats(self) -> dict:
+        """Return the queue depth and the latency of the jobs in seconds."""
+        return {
+            "max_workers": self.max_workers,
+            "queued": self.queued,
+            "running": self.running,
+            "last_wait": round(self.last_wait, 3),
+            "last_runtime": round(self.last_runtime, 3),
+            "max_wait": round(self.max_wait, 3),
+        }
+
+    async def async_run(self, target, *args):
+        """Run a blocking function in the pool and return its result."""
+        loop = asyncio.get_running_loop()
+        submitted = time.monotonic()
+
+        def job():
+            # the counters are only changed on the event loop
+            started = time.monotonic()
+            loop.call_soon_threadsafe(self._job_started, started - submitted)
+            try:
+                return target(*args)
+            finally:
+                loop.call_soon_threadsafe(
+                    self._job_finished, target, time.monotonic() - started
+                )
+
+        def done(future: Future) -> None:
+            if future.cancelled():
+                # cancelled before it was started, e.g. by its caller
+                loop.call_soon_threadsafe(self._job_cancelled)
+
+        self.queued += 1
+        future = self._executor.submit(job)
+        future.add_done_callback(done)
+        # a cancelled caller cancels the job only if it is not started yet
+        return await asyncio.wrap_future(future)
+
+    @callback
+    def _job_started(self, wait: float) -> None:
+        self.queued -= 1
+        self.running += 1
+        self.last_wait = wait
+        self.max_wait = max(self.max_wait, wait)
+
+    @callback
+    def _job_finished(self, target, runtime: float) -> None:
+        self.running -= 1
+        self.last_runtime = runtime
+        _LOGGER.debug(
+            "Job %s waited %.3fs, ran %.3fs (%s)",
+            getattr(target, "__name__", target),
+            self.last_wait,
+            runtime,
+            self.stats,
+        )
+
+    @callback
+    def _job_cancelled(self) -> None:
+        self.queued -= 1
+
+    def shutdown(self) -> None:
+        """Stop the threads, jobs that are not started yet are cancelled."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@singleton(f"{DOMAIN}_executor")
+@callback
+def async_get_executor(hass: HomeAssistant) -> WebUntisExecutor:
+    """Return the executor shared by all WebUntis entries."""
+    executor = WebUntisExecutor()
+
+    @callback
+    def _async_shutdown(event: Event) -> None:
+        executor.shutdown()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_shutdown)
+
+    return executor
+
+
+async def async_add_webuntis_job(hass: HomeAssistant, target, *args):
+    """Run a blocking webuntis library call in the executor of the integration."""
+    return await async_get_executor(hass).async_run(target, *args)
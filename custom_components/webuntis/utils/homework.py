@@ -1,15 +1,104 @@
+import asyncio
 from datetime import date, timedelta, datetime
 from webuntis import errors
 import pytz  # to handle timezone conversions
 
 from homeassistant.components.calendar import CalendarEvent
 
-from custom_components.webuntis.const import DAYS_TO_CHECK
+from custom_components.webuntis.const import DAYS_TO_CHECK, HOMEWORK_REFRESH_DAYS
 
 # pylint: disable=relative-beyond-top-level
 from ..utils.web_untis import get_lesson_name_str
 
 
+class HomeworkCache:
+    """
+    Homework response data bucketed by assignment date. Only the days around
+    today and days that are not cached yet are fetched again.
+    """
+
+    def __init__(self):
+        self._days = {}
+        self._teachers = {}
+
+    def fetch_ranges(self, start, end, today):
+        """Return the (start, end) ranges of days that have to be fetched"""
+        near_start = today - timedelta(days=HOMEWORK_REFRESH_DAYS)
+        near_end = today + timedelta(days=HOMEWORK_REFRESH_DAYS)
+
+        ranges = []
+        day = start
+        while day <= end:
+            if day not in self._days or near_start <= day <= near_end:
+                if ranges and ranges[-1][1] == day - timedelta(days=1):
+                    ranges[-1][1] = day
+                else:
+                    ranges.append([day, day])
+            day += timedelta(days=1)
+        return [tuple(days) for days in ranges]
+
+    def update(self, start, end, response_data):
+        """Replace the days from start to end with a fetched response"""
+        data = response_data.get("data", {})
+        lessons = {lesson["id"]: lesson for lesson in data.get("lessons", [])}
+        records = data.get("records", [])
+
+        day = start
+        while day <= end:
+            self._days[day] = {"homeworks": [], "records": [], "lessons": []}
+            day += timedelta(days=1)
+
+        for homework in data.get("homeworks", []):
+            day = datetime.strptime(str(homework.get("date")), "%Y%m%d").date()
+            if not start <= day <= end:
+                continue
+
+            bucket = self._days[day]
+            bucket["homeworks"].append(homework)
+            bucket["records"].extend(
+                rec for rec in records if rec["homeworkId"] == homework.get("id")
+            )
+            lesson = lessons.get(homework.get("lessonId"))
+            if lesson is not None and lesson not in bucket["lessons"]:
+                bucket["lessons"].append(lesson)
+
+        for teacher in data.get("teachers", []):
+            self._teachers[teacher["id"]] = teacher
+
+    def evict(self, start, end):
+        """Forget the days outside of start to end"""
+        for day in [day for day in self._days if not start <= day <= end]:
+            del self._days[day]
+
+    def as_dict(self):
+        """Return the cached days, e.g. for a store"""
+        return {
+            "days": {day.isoformat(): bucket for day, bucket in self._days.items()},
+            "teachers": list(self._teachers.values()),
+        }
+
+    def restore(self, data):
+        """Restore the cache from as_dict data"""
+        for day, bucket in data["days"].items():
+            self._days[date.fromisoformat(day)] = bucket
+        for teacher in data["teachers"]:
+            self._teachers[teacher["id"]] = teacher
+
+    def response_data(self):
+        """Merge the cached days into one response like the API returns it"""
+        data = {"homeworks": [], "records": [], "lessons": []}
+        lessons = {}
+        for day in sorted(self._days):
+            bucket = self._days[day]
+            data["homeworks"].extend(bucket["homeworks"])
+            data["records"].extend(bucket["records"])
+            for lesson in bucket["lessons"]:
+                lessons[lesson["id"]] = lesson
+        data["lessons"] = list(lessons.values())
+        data["teachers"] = list(self._teachers.values())
+        return {"data": data}
+
+
 class HomeworkEventsFetcher:
     def __init__(
         self,
@@ -46,6 +135,33 @@ class HomeworkEventsFetcher:
         homework_events = self._process_homework_data(homework_data)
         return homework_events
 
+    async def _async_get_homework_events(self, cache):
+        """
+        Async version of _get_homework_events, running on the event loop.
+        Only the days that have to be refreshed are fetched into cache.
+        """
+        today = date.today()
+        start = today - timedelta(days=DAYS_TO_CHECK)
+        end = today + timedelta(days=DAYS_TO_CHECK)
+
+        cache.evict(start, end)
+        ranges = cache.fetch_ranges(start, end, today)
+
+        # Fetch homework data using the session object, errors are passed on
+        # as OSError so the cached homework is kept
+        results = await asyncio.gather(
+            *(
+                self.session.async_get_homeworks(start=range_start, end=range_end)
+                for range_start, range_end in ranges
+            )
+        )
+
+        for (range_start, range_end), homework_data in zip(ranges, results):
+            cache.update(range_start, range_end, homework_data)
+
+        # Process the cached homework data and extract the homework events
+        return self._process_homework_data(cache.response_data())
+
     def _process_homework_data(self, response_data):
         """
         Process the homework response data and return a list of event dictionaries.
@@ -133,3 +249,13 @@ class HomeworkEventsFetcher:
 def return_homework_events(server):
     fetcher = HomeworkEventsFetcher(server)
     return fetcher._get_homework_events()
+
+
+async def async_return_homework_events(server, cache):
+    fetcher = HomeworkEventsFetcher(server)
+    return await fetcher._async_get_homework_events(cache)
+
+
+def return_cached_homework_events(server, cache):
+    fetcher = HomeworkEventsFetcher(server)
+    return fetcher._process_homework_data(cache.response_data())
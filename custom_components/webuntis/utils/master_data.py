@@ -0,0 +1,95 @@
+"""Master data shared by the config entries of the same school"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+
+from ..const import DOMAIN, MASTER_DATA_TTL
+from .snapshot import raw_data
+
+
+class SchoolMasterData:
+    """
+    JSON data of the schoolyears, subjects, klassen, rooms and teachers of a
+    school. Every entry wraps the data in result objects of its own session.
+    """
+
+    def __init__(self) -> None:
+        # list name: raw list, and the raw current schoolyear
+        self.data = {}
+        self.fetched: datetime | None = None
+        self.refs = 0
+        # one entry fetches at a time, the others use its result
+        self.lock = asyncio.Lock()
+
+    def stale(self, now: datetime) -> bool:
+        """Master data is refreshed on day change and after MASTER_DATA_TTL."""
+        return (
+            self.fetched is None
+            or self.fetched.date() != now.date()
+            or now - self.fetched > timedelta(seconds=MASTER_DATA_TTL)
+        )
+
+    def missing(self, lists) -> list:
+        """Return the names of the lists that are not shared yet"""
+        return [name for name in lists if name not in self.data]
+
+    def update(self, master_data: dict, fetched: datetime) -> None:
+        """
+        Share the lists of a fetch. Lists that failed keep their data, they may
+        not be accessible for the entry that fetched them.
+        """
+        for name, result in master_data.items():
+            if isinstance(result, Exception):
+                continue
+            self.data[name] = raw_data(result)
+            if name == "schoolyears":
+                current = result.__dict__.get("current")
+                self.data["current_schoolyear"] = current._data if current else None
+        self.fetched = fetched
+
+    def restore(self, data: dict, fetched: datetime) -> None:
+        """Share stored data of an entry, if it is newer than the shared data"""
+        if self.fetched is None or fetched > self.fetched:
+            self.data = dict(data)
+            self.fetched = fetched
+
+
+@singleton(f"{DOMAIN}_master_data")
+@callback
+def _async_get_schools(hass: HomeAssistant) -> dict:
+    """Return the shared master data per (server, school)."""
+    return {}
+
+
+def _school_key(server: str, school: str) -> tuple[str, str]:
+    """School names and servers are not case sensitive"""
+    return server.lower(), school.lower()
+
+
+@callback
+def async_acquire_master_data(
+    hass: HomeAssistant, server: str, school: str
+) -> SchoolMasterData:
+    """Return the shared master data of a school, release it on unload."""
+    schools = _async_get_schools(hass)
+    master_data = schools.setdefault(_school_key(server, school), SchoolMasterData())
+    master_data.refs += 1
+    return master_data
+
+
+@callback
+def async_release_master_data(hass: HomeAssistant, server: str, school: str) -> None:
+    """Release the shared master data, the last entry of the school drops it."""
+    schools = _async_get_schools(hass)
+    key = _school_key(server, school)
+    master_data = schools.get(key)
+    if master_data is None:
+        return
+    master_data.refs -= 1
+    if master_data.refs <= 0:
+        del schools[key]
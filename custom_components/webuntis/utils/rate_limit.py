@@ -0,0 +1,212 @@
+"""Rate limit of the requests to a WebUntis server"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+import requests
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+from webuntis.utils.userinput import server as normalize_server
+
+from ..const import (
+    DOMAIN,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_MAX,
+    RATE_LIMIT_MIN,
+    RATE_LIMIT_START,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# HTTP status of a server that throttles or is overloaded
+THROTTLED_STATUS = (429, 503)
+
+
+class ThrottledError(OSError):
+    """The server throttled the request or is overloaded."""
+
+
+class BlockingRequestError(OSError):
+    """A blocking request was sent from the event loop."""
+
+
+def check_throttled(url: str, status: int) -> None:
+    """Raise a throttled or overloaded response as ThrottledError"""
+    if status in THROTTLED_STATUS:
+        raise ThrottledError(f"Request to {url} was throttled ({status})")
+
+
+class RateLimiter:
+    """
+    Token bucket of one server, shared by the sessions of all entries. The
+    rate grows while requests succeed and is halved when the server throttles
+    a request or times out (AIMD), so it stays near the highest rate the
+    server accepts.
+
+    Async requests and the blocking library calls in the executor both take
+    their tokens from it.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        rate: float = RATE_LIMIT_START,
+        burst: int = RATE_LIMIT_BURST,
+    ) -> None:
+        self.host = host
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+
+        # metrics
+        self.requests = 0
+        self.throttled = 0
+        self.waiting = 0
+        self.last_wait = 0.0
+        self.max_wait = 0.0
+        self.total_wait = 0.0
+
+    @property
+    def stats(self) -> dict:
+        """Return the rate and the time the requests waited for it in seconds."""
+        return {
+            "rate": round(self.rate, 2),
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "waiting": self.waiting,
+            "last_wait": round(self.last_wait, 3),
+            "max_wait": round(self.max_wait, 3),
+            "total_wait": round(self.total_wait, 3),
+        }
+
+    def _reserve(self) -> float:
+        """Take a token and return the seconds until it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._refilled) * self.rate
+            )
+            self._refilled = now
+            # the token may be borrowed from the future, the request waits for it
+            self._tokens -= 1
+            wait = max(-self._tokens / self.rate, 0.0)
+
+            self.requests += 1
+            self.last_wait = wait
+            self.max_wait = max(self.max_wait, wait)
+            self.total_wait += wait
+            return wait
+
+    async def async_acquire(self) -> None:
+        """Wait for a token on the event loop."""
+        wait = self._reserve()
+        if wait:
+            self._log_wait(wait)
+            self.waiting += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self.waiting -= 1
+
+    def acquire(self) -> None:
+        """Wait for a token in an executor thread."""
+        wait = self._reserve()
+        if wait:
+            self._log_wait(wait)
+            time.sleep(wait)
+
+    def _log_wait(self, wait: float) -> None:
+        _LOGGER.debug("Request to %s waits %.3fs (%s)", self.host, wait, self.stats)
+
+    @contextmanager
+    def track(self):
+        """
+        Adapt the rate to the outcome of the HTTP round trip in the block.
+        Other errors, e.g. of a refused connection, leave the rate as it is.
+        """
+        try:
+            yield
+        except (ThrottledError, TimeoutError, requests.exceptions.Timeout):
+            self._decrease()
+            raise
+        self._increase()
+
+    def _increase(self) -> None:
+        """Additive increase, by about one request per second every second."""
+        with self._lock:
+            self.rate = min(self.rate + 1 / self.rate, RATE_LIMIT_MAX)
+
+    def _decrease(self) -> None:
+        """Multiplicative decrease after a throttled or timed out request."""
+        with self._lock:
+            self.throttled += 1
+            self.rate = max(self.rate / 2, RATE_LIMIT_MIN)
+            # the requests already waiting do not run in a burst
+            self._tokens = min(self._tokens, 0.0)
+        _LOGGER.debug(
+            "Request to %s throttled, rate lowered to %.2f/s", self.host, self.rate
+        )
+
+
+class RateLimitedSession(requests.Session):
+    """
+    requests session of the blocking calls, every request takes a token of
+    the rate limiter. Requests without a timeout get the one of the session.
+    """
+
+    def __init__(self, rate_limiter: RateLimiter, timeout: float) -> None:
+        super().__init__()
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+
+    def request(self, method, url, *args, **kwargs):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            # e.g. a lazy lookup of a lesson that is not in the session cache,
+            # it would block the event loop until the request is answered
+            raise BlockingRequestError(f"Blocking request to {url} from the event loop")
+        kwargs.setdefault("timeout", self.timeout)
+        self.rate_limiter.acquire()
+        with self.rate_limiter.track():
+            response = super().request(method, url, *args, **kwargs)
+            check_throttled(url, response.status_code)
+        return response
+
+
+def rate_limit_host(server: str) -> str:
+    """
+    Return the hostname of a server, the key of its rate limiter. The server
+    is normalized like the webuntis library does, so the same host written
+    differently shares one limiter.
+    """
+    try:
+        server = normalize_server(server.strip())
+    except ValueError:
+        return server.strip().lower()
+    return (urlparse(server).hostname or server).lower()
+
+
+@singleton(f"{DOMAIN}_rate_limiters")
+@callback
+def _async_get_rate_limiters(hass: HomeAssistant) -> dict:
+    """Return the rate limiters per hostname."""
+    return {}
+
+
+@callback
+def async_get_rate_limiter(hass: HomeAssistant, server: str) -> RateLimiter:
+    """Return the rate limiter shared by all entries of a server."""
+    host = rate_limit_host(server)
+    rate_limiters = _async_get_rate_limiters(hass)
+    if host not in rate_limiters:
+        rate_limiters[host] = RateLimiter(host)
+    return rate_limiters[host]
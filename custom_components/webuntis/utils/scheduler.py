@@ -0,0 +1,155 @@
+"""Adaptive polling schedule derived from the cached timetable and holidays"""
+
+import asyncio
+import hashlib
+from datetime import date, datetime, time, timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+
+from ..const import (
+    DOMAIN,
+    HOLIDAY_HEARTBEAT,
+    MAX_CONCURRENT_UPDATES,
+    SCAN_INTERVAL,
+    SCAN_INTERVAL_IDLE,
+    SCAN_INTERVAL_LEAD,
+    SCHOOL_DAY_LEAD,
+    UPDATE_BACKOFF_MAX,
+    UPDATE_SLOW_DURATION,
+)
+
+
+def school_hours(lessons) -> dict:
+    """Return the first start and the last end of the lessons per day"""
+    days = {}
+    for lesson in lessons:
+        day = lesson.start.date()
+        if day not in days:
+            days[day] = [lesson.start, lesson.end]
+        else:
+            days[day][0] = min(days[day][0], lesson.start)
+            days[day][1] = max(days[day][1], lesson.end)
+    return days
+
+
+def merge_holidays(holidays) -> list:
+    """Merge overlapping and adjacent (start, end) date ranges"""
+    merged = []
+    for start, end in sorted(holidays):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def holiday_resume(now: datetime, holidays) -> datetime | None:
+    """
+    If now is in a holiday, return the start of its second to last day,
+    when full polling resumes. Otherwise return None.
+    """
+    for start, end in merge_holidays(holidays):
+        resume = datetime.combine(end - timedelta(days=1), time())
+        if start <= now.date() and now < resume:
+            return resume
+    return None
+
+
+def next_update_delay(
+    now: datetime, lessons=None, schoolyear_end: date | None = None, holidays=()
+) -> float:
+    """
+    Seconds until the next update.
+
+    Polls every SCAN_INTERVAL_LEAD in the hour before the first lesson of a
+    day, every SCAN_INTERVAL until the last lesson ends and every
+    SCAN_INTERVAL_IDLE otherwise, but always wakes up for the next school day.
+    In holidays and after the schoolyear only a HOLIDAY_HEARTBEAT is left.
+    Without a timetable it falls back to SCAN_INTERVAL.
+
+    :param now: Current local time, naive like the lesson times
+    :param lessons: Cached lessons with start and end
+    :param schoolyear_end: Last day of the current schoolyear, if known
+    :param holidays: (start, end) dates of the holidays, both inclusive
+    """
+    resume = holiday_resume(now, holidays)
+    if resume is not None:
+        return max(min(HOLIDAY_HEARTBEAT, (resume - now).total_seconds()), 1)
+
+    if schoolyear_end is not None and now.date() > schoolyear_end:
+        # the next schoolyear is not known before it starts
+        return HOLIDAY_HEARTBEAT
+
+    if lessons is None:
+        return SCAN_INTERVAL
+
+    lead = timedelta(seconds=SCHOOL_DAY_LEAD)
+    next_lead_start = None
+
+    for first_start, last_end in sorted(school_hours(lessons).values()):
+        if now >= last_end:
+            continue
+        if now >= first_start:
+            return SCAN_INTERVAL
+        if now >= first_start - lead:
+            return min(SCAN_INTERVAL_LEAD, (first_start - now).total_seconds())
+        next_lead_start = first_start - lead
+        break
+
+    delay = SCAN_INTERVAL_IDLE
+    if next_lead_start is not None:
+        delay = min(delay, (next_lead_start - now).total_seconds())
+
+    return max(delay, 1)
+
+
+def update_backoff(backoff: float, duration: float) -> float:
+    """
+    Minimum seconds between updates for a slow server. It doubles, starting
+    at SCAN_INTERVAL, after an update that took longer than
+    UPDATE_SLOW_DURATION, and is reset after a fast update.
+
+    :param backoff: Backoff after the previous update
+    :param duration: Seconds the last update took
+    """
+    if duration <= UPDATE_SLOW_DURATION:
+        return 0
+    return min(max(backoff * 2, SCAN_INTERVAL), UPDATE_BACKOFF_MAX)
+
+
+def update_phase(key: str) -> float:
+    """
+    Deterministic fraction in [0, 1) of an entry, the position of its updates
+    within the polling interval. It is the same after every restart.
+    """
+    digest = hashlib.sha256(key.encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64
+
+
+def first_update_delay(timestamp: float, phase: float) -> float:
+    """Seconds until the first slot of an entry after a restart"""
+    return (phase * SCAN_INTERVAL - timestamp) % SCAN_INTERVAL
+
+
+def staggered_delay(timestamp: float, delay: float, phase: float) -> float:
+    """
+    Move an update to the nearest slot of the entry, so entries polling with
+    the same delay are spread over the interval instead of running together.
+    Slots repeat every delay, at most every SCAN_INTERVAL.
+
+    :param timestamp: Current POSIX timestamp
+    :param delay: Seconds until the next update, see next_update_delay
+    :param phase: Phase of the entry, see update_phase
+    """
+    period = min(max(delay, 1), SCAN_INTERVAL)
+    offset = phase * period
+    due = round((timestamp + delay - offset) / period) * period + offset
+    return max(due - timestamp, 1)
+
+
+@singleton(f"{DOMAIN}_update_semaphore")
+@callback
+def async_get_update_semaphore(hass: HomeAssistant) -> asyncio.Semaphore:
+    """Return the semaphore limiting the entries that update at the same time."""
+    return asyncio.Semaphore(MAX_CONCURRENT_UPDATES)
@@ -0,0 +1,216 @@
+"""Timetable snapshot shared by all derived sensors"""
+
+import asyncio
+import weakref
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+from webuntis import objects
+
+from ..const import DOMAIN, SHARED_TIMETABLE_REUSE, TIMETABLE_TIERS
+
+
+class TimetableSnapshot:
+    """
+    One timetable fetch of the widest window needed in an update cycle.
+
+    The lessons are sorted by start once, so sensors, calendars and notify
+    can slice the days they need without another request.
+    """
+
+    def __init__(self, lessons, start: date, end: date) -> None:
+        self.start = start
+        self.end = end
+        self.fetched_at = datetime.now()
+
+        self.lessons = sorted(lessons, key=lambda lesson: lesson.start)
+        self._days = [lesson.start.date() for lesson in self.lessons]
+
+    def __len__(self) -> int:
+        return len(self.lessons)
+
+    def covers(self, start: date, end: date) -> bool:
+        """Check if the snapshot contains the whole date range"""
+        return self.start <= start and end <= self.end
+
+    def get_lessons(self, start: date, end: date) -> list:
+        """Return the lessons from start to end (both inclusive), sorted by start"""
+        return self.lessons[
+            bisect_left(self._days, start) : bisect_right(self._days, end)
+        ]
+
+
+class TimetableCache:
+    """
+    Day-keyed timetable cache, refreshed in tiers.
+
+    Substitutions mostly affect today and tomorrow, so days further away are
+    reused until they reach the max age of their tier.
+    """
+
+    def __init__(self, tiers) -> None:
+        self.tiers = tiers
+        self._days = {}
+        self._fetched = {}
+
+    def _max_age(self, day: date, today: date) -> timedelta:
+        offset = (day - today).days
+        max_age = self.tiers[-1][2]
+        for first, last, tier_max_age in self.tiers:
+            if first <= offset <= last:
+                max_age = tier_max_age
+                break
+        return timedelta(seconds=max_age)
+
+    def stale_ranges(self, start: date, end: date, now: datetime) -> list:
+        """Return the (start, end) ranges of days that have to be fetched again"""
+        ranges = []
+        for day in _days_between(start, end):
+            fetched = self._fetched.get(day)
+            if fetched is not None and now - fetched < self._max_age(day, now.date()):
+                continue
+            if ranges and ranges[-1][1] == day - timedelta(days=1):
+                ranges[-1][1] = day
+            else:
+                ranges.append([day, day])
+        return [tuple(days) for days in ranges]
+
+    def update(self, start: date, end: date, lessons, fetched_at: datetime) -> None:
+        """Replace the days from start to end with a fetch result"""
+        for day in _days_between(start, end):
+            self._days[day] = []
+            self._fetched[day] = fetched_at
+        for lesson in lessons:
+            day = lesson.start.date()
+            if day in self._days and start <= day <= end:
+                self._days[day].append(lesson)
+
+    def evict(self, start: date, end: date) -> None:
+        """Forget the days outside of start to end"""
+        for day in [day for day in self._days if not start <= day <= end]:
+            del self._days[day]
+            del self._fetched[day]
+
+    def as_dict(self) -> dict:
+        """Return the raw lesson data of the cache, e.g. for a store"""
+        return {
+            "days": {
+                day.isoformat(): raw_data(lessons)
+                for day, lessons in self._days.items()
+            },
+            "fetched": {
+                day.isoformat(): fetched.isoformat()
+                for day, fetched in self._fetched.items()
+            },
+        }
+
+    def restore(self, data: dict, session) -> None:
+        """Restore the cache from as_dict data, the lessons use session for lookups"""
+        for day, lessons in data["days"].items():
+            self._days[date.fromisoformat(day)] = list(
+                objects.PeriodList(data=lessons, session=session)
+            )
+        for day, fetched in data["fetched"].items():
+            self._fetched[date.fromisoformat(day)] = datetime.fromisoformat(fetched)
+
+    def sync(self, shared, start: date, end: date, session) -> None:
+        """
+        Take over the days from start to end that the shared timetable fetched
+        more recently, the lessons use session for lookups.
+        """
+        for day in _days_between(start, end):
+            fetched = shared._fetched.get(day)
+            if fetched is None or (
+                day in self._fetched and fetched <= self._fetched[day]
+            ):
+                continue
+            self._days[day] = list(
+                objects.PeriodList(data=list(shared._days[day]), session=session)
+            )
+            self._fetched[day] = fetched
+
+    def snapshot(self, start: date, end: date, today: date) -> TimetableSnapshot | None:
+        """
+        Build a snapshot of the cached days from start to end. If days are
+        missing, it only covers the cached days around today.
+        """
+        if today not in self._days:
+            return None
+
+        first = last = today
+        while first > start and first - timedelta(days=1) in self._days:
+            first -= timedelta(days=1)
+        while last < end and last + timedelta(days=1) in self._days:
+            last += timedelta(days=1)
+
+        lessons = [
+            lesson for day in _days_between(first, last) for lesson in self._days[day]
+        ]
+        return TimetableSnapshot(lessons, first, last)
+
+
+def raw_data(result_list) -> list:
+    """Return the JSON data of the items of a webuntis list result"""
+    return [item._data for item in result_list]
+
+
+def _days_between(start: date, end: date):
+    """Iterate the days from start to end, both inclusive"""
+    for offset in range((end - start).days + 1):
+        yield start + timedelta(days=offset)
+
+
+class SharedTimetable(TimetableCache):
+    """
+    Raw timetable days of one element, shared by the entries that watch it.
+
+    Every entry wraps the days in lessons of its own session, so lookups,
+    filters and notifications stay per entry.
+    """
+
+    def __init__(self, tiers) -> None:
+        super().__init__(tiers)
+        # one entry fetches the stale days, the others wait and reuse them
+        self.lock = asyncio.Lock()
+
+    def _max_age(self, day: date, today: date) -> timedelta:
+        # days refreshed every cycle are reused by the entries updating with it
+        return max(
+            super()._max_age(day, today), timedelta(seconds=SHARED_TIMETABLE_REUSE)
+        )
+
+    def update(self, start: date, end: date, lessons, fetched_at: datetime) -> None:
+        """Replace the days from start to end with the raw lessons of a fetch"""
+        for day in _days_between(start, end):
+            self._days[day] = []
+            self._fetched[day] = fetched_at
+        for lesson in lessons:
+            day = datetime.strptime(str(lesson["date"]), "%Y%m%d").date()
+            if start <= day <= end:
+                self._days[day].append(lesson)
+
+    def merge(self, cache: TimetableCache) -> None:
+        """Take over the days an entry cached more recently, e.g. after a restart"""
+        for day, fetched in cache._fetched.items():
+            if day not in self._fetched or fetched > self._fetched[day]:
+                self._days[day] = raw_data(cache._days[day])
+                self._fetched[day] = fetched
+
+
+@singleton(f"{DOMAIN}_shared_timetables")
+@callback
+def _async_get_shared_timetables(hass: HomeAssistant) -> weakref.WeakValueDictionary:
+    """Shared timetables, dropped when no entry watches their element anymore."""
+    return weakref.WeakValueDictionary()
+
+
+@callback
+def async_get_shared_timetable(hass: HomeAssistant, key: tuple) -> SharedTimetable:
+    """Return the shared timetable of an element, key is (server, school, type, id)."""
+    timetables = _async_get_shared_timetables(hass)
+    shared = timetables.get(key)
+    if shared is None:
+        shared = timetables[key] = SharedTimetable(TIMETABLE_TIERS)
+    return shared
@@ -4,9 +4,28 @@ import copy
 import logging
 from datetime import timedelta
 
+import aiohttp
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.singleton import singleton
+
+from ..const import DOMAIN
+
 _LOGGER = logging.getLogger(__name__)
 
 
+@singleton(f"{DOMAIN}_http_session")
+@callback
+def async_get_http_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """
+    Return the aiohttp session shared by all WebUntis entries.
+
+    The session does not keep cookies, every request sends the JSESSIONID
+    of its own login, so entries on the same server can not mix them up.
+    """
+    return async_create_clientsession(hass, cookie_jar=aiohttp.DummyCookieJar())
+
+
 def is_service(hass, entry):
     """check whether config entry is a service"""
     domain, service = entry.split(".")[0], ".".join(entry.split(".")[1:])
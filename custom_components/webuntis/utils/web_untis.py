@@ -19,6 +19,27 @@ def get_timetable_object(timetable_source_id, timetable_source, session):
     return {timetable_source: source}
 
 
+async def async_get_timetable_object(timetable_source_id, timetable_source, session):
+    """async version of get_timetable_object for the ExtendedSession"""
+
+    source = None
+
+    if timetable_source == "student":
+        source = await session.async_get_student(
+            timetable_source_id[1], timetable_source_id[0]
+        )
+    elif timetable_source == "klasse":
+        klassen = await session.async_klassen(from_cache=True)
+
+        source = next(iter(klassen.filter(name=timetable_source_id)), None)
+    elif timetable_source == "teacher":
+        source = await session.async_get_teacher(
+            timetable_source_id[1], timetable_source_id[0]
+        )
+
+    return {timetable_source: source}
+
+
 from datetime import datetime
 
 
@@ -1,13 +1,63 @@
-import requests
+import asyncio
+import copy
 import json
-from webuntis import errors
-from webuntis.utils import log  # pylint: disable=no-name-in-module
+import aiohttp
+from webuntis import errors, objects
+from webuntis.utils import cache_key, log  # pylint: disable=no-name-in-module
+from webuntis.utils.remote import _parse_result, _request_getid
 from webuntis.session import Session as WebUntisSession
 
 import logging
 
+from ..const import MAX_CONCURRENT_REQUESTS, REQUEST_TIMEOUT
+from .rate_limit import (
+    RateLimitedSession,
+    RateLimiter,
+    check_throttled,
+    rate_limit_host,
+)
+
 # logging.basicConfig(level=logging.DEBUG)
 
+ELEMENT_TYPES = {
+    "klasse": 1,
+    "teacher": 2,
+    "subject": 3,
+    "room": 4,
+    "student": 5,
+}
+
+# name: (result class, JSON-RPC method)
+MASTER_DATA_LISTS = {
+    "schoolyears": (objects.SchoolyearList, "getSchoolyears"),
+    "subjects": (objects.SubjectList, "getSubjects"),
+    "klassen": (objects.KlassenList, "getKlassen"),
+    "rooms": (objects.RoomList, "getRooms"),
+    "teachers": (objects.TeacherList, "getTeachers"),
+}
+
+# error code of an expired or unknown session
+NOT_LOGGED_IN_CODE = -8520
+
+# JSON-RPC 2.0 error codes of a server that cannot read a batch array
+BATCH_UNSUPPORTED_CODES = (-32700, -32600)
+
+
+def _parse_rpc_result(request_body, result_body):
+    """
+    _parse_result of the library, but an expired session is raised without
+    logging an error, as it is handled by logging in again.
+    """
+    error = result_body.get("error")
+    if isinstance(error, dict) and error.get("code") == NOT_LOGGED_IN_CODE:
+        exc = errors.NotLoggedInError(error.get("message"))
+        exc.request = request_body
+        exc.result = result_body
+        exc.code = NOT_LOGGED_IN_CODE
+        raise exc
+
+    return _parse_result(request_body, result_body)
+
 
 class ExtendedSession(WebUntisSession):
     """
@@ -15,13 +65,538 @@ class ExtendedSession(WebUntisSession):
     fetching homeworks from the WebUntis API using a different endpoint.
     """
 
-    def _send_custom_request(self, endpoint, params):
+    def __init__(
+        self,
+        http_session=None,
+        timeout=REQUEST_TIMEOUT,
+        max_concurrent_requests=MAX_CONCURRENT_REQUESTS,
+        on_login=None,
+        rate_limiter=None,
+        **config,
+    ):
         """
-        A custom method for sending a request to a specific endpoint, different from the JSON-RPC method.
+        :param http_session: aiohttp.ClientSession used by the async methods
+        :param timeout: Deadline in seconds for every single request
+        :param max_concurrent_requests: Limit of async requests in flight at once
+        :param on_login: Coroutine function called after every async login
+        :param rate_limiter: RateLimiter shared with the other sessions of the
+            server, every request takes a token from it
+        """
+        # the library logs in again once if a JSON-RPC request finds no valid session
+        config.setdefault("login_repeat", 1)
+        super().__init__(**config)
+        self.http_session = http_session
+        self.timeout = timeout
+        self.on_login = on_login
+        self._request_limit = asyncio.Semaphore(max_concurrent_requests)
+        self.rate_limiter = rate_limiter or RateLimiter(
+            rate_limit_host(self.config["server"])
+        )
+        # the blocking requests of the library use this session
+        self.config["_http_session"] = RateLimitedSession(
+            self.rate_limiter, self.timeout
+        )
+        self._login_lock = asyncio.Lock()
+        self._batch_supported = True
+        # (method, params) of the requests in flight
+        self._in_flight = {}
+
+    async def _async_relogin(self, failed_jsessionid):
+        """
+        Log in again after a request found the session invalid. Concurrent
+        requests that failed with the same session share one login.
+        """
+        async with self._login_lock:
+            if (
+                "jsessionid" in self.config
+                and self.config["jsessionid"] != failed_jsessionid
+            ):
+                return
+
+            log("debug", "Session is not valid anymore, logging in again")
+            await self.async_login()
+
+    async def _async_logged_in_call(self, request, *args):
+        """
+        Run a request optimistically with the current session. If it is not
+        valid anymore, log in again and retry the request once.
+        """
+        # the FilterDict of the library config has no get()
+        try:
+            jsessionid = self.config["jsessionid"]
+        except KeyError:
+            jsessionid = None
+
+        try:
+            return await request(*args)
+        except errors.NotLoggedInError:
+            await self._async_relogin(jsessionid)
+
+        return await request(*args)
+
+    async def _async_single_flight(self, key, request, *args):
+        """
+        Run a request, or join the identical request that is already in flight.
+
+        Every caller gets a shallow copy of the result, as the result classes
+        of the library replace the items of their data list in place.
+        """
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(request(*args))
+            self._in_flight[key] = future
+
+            def _done(done_future):
+                del self._in_flight[key]
+                # the error is retrieved even if every caller was cancelled
+                if not done_future.cancelled():
+                    done_future.exception()
+
+            future.add_done_callback(_done)
+        else:
+            log("debug", f"Joining request {key[0]} in flight")
+
+        # a cancelled caller does not cancel the request of the others
+        return copy.copy(await asyncio.shield(future))
+
+    @staticmethod
+    def _request_key(name, params):
+        """Key of identical requests, params are compared by their JSON"""
+        return name, json.dumps(params, sort_keys=True, default=str)
+
+    async def _async_post_rpc(self, payload, authenticate=False):
+        """
+        Post a JSON-RPC payload (a single call or a batch array) and return
+        the decoded response.
+
+        Transport errors are raised as OSError, like the requests library does.
+        """
+        url = f"{self.config['server']}?school={self.config['school']}"
+
+        headers = {
+            "User-Agent": self.config["useragent"],
+            "Content-Type": "application/json",
+        }
+
+        if not authenticate:
+            if "jsessionid" in self.config:
+                headers["Cookie"] = f'JSESSIONID={self.config["jsessionid"]}'
+            else:
+                raise errors.NotLoggedInError(
+                    "Don't have JSESSIONID. Did you already log out?"
+                )
+
+        await self.rate_limiter.async_acquire()
+        with self.rate_limiter.track():
+            try:
+                async with self._request_limit, self.http_session.post(
+                    url,
+                    data=json.dumps(payload),
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                ) as response:
+                    check_throttled(url, response.status)
+                    response_text = await response.text()
+            except TimeoutError:
+                # a timeout is passed on as it is, it lowers the rate
+                raise
+            except aiohttp.ClientError as error:
+                raise OSError(f"Request to {url} failed: {error}") from error
+
+        try:
+            return json.loads(response_text)
+        except ValueError:
+            raise errors.RemoteError("Invalid JSON", response_text)
+
+    async def _async_request(self, method, params=None):
+        """
+        Async version of the JSON-RPC request of the webuntis library, using
+        the same jsessionid handling and error codes.
+
+        :param method: The JSON-RPC method to be executed
+        :param params: JSON-RPC parameters to the method
+        :return: The result attribute of the JSON-RPC response
+        """
+        if method in ("authenticate", "logout"):
+            return await self._async_request_once(method, params)
+
+        return await self._async_single_flight(
+            self._request_key(method, params),
+            self._async_logged_in_call,
+            self._async_request_once,
+            method,
+            params,
+        )
+
+    async def _async_request_once(self, method, params=None):
+        """Send a single JSON-RPC request without retry."""
+        request_body = {
+            "id": _request_getid(),
+            "method": method,
+            "params": params or {},
+            "jsonrpc": "2.0",
+        }
+
+        if method != "authenticate":
+            # user credentials will not be logged
+            log("debug", f"Making async request {method} with params: {params}")
+
+        result_body = await self._async_post_rpc(
+            request_body, authenticate=method == "authenticate"
+        )
+
+        return _parse_rpc_result(request_body, result_body)
+
+    async def _async_batch_request(self, calls):
+        """
+        Send several JSON-RPC calls as one JSON-RPC 2.0 batch request.
+
+        Falls back to single requests if the server answers the batch with a
+        parse error or an invalid request error.
+
+        :param calls: List of (method, params) tuples
+        :return: List with the result, or the raised exception, of every call
+            in the order of the calls
+        """
+        return await self._async_logged_in_call(self._async_batch_request_once, calls)
+
+    async def _async_batch_request_once(self, calls):
+        """Send a batch request without retry."""
+        if not self._batch_supported:
+            results = await asyncio.gather(
+                *(self._async_request(method, params) for method, params in calls),
+                return_exceptions=True,
+            )
+            for result in results:
+                # like in a batch, only errors of a single call are returned
+                if isinstance(result, errors.NotLoggedInError) or (
+                    isinstance(result, BaseException)
+                    and not isinstance(result, errors.Error)
+                ):
+                    raise result
+            return results
+
+        request_id = _request_getid()
+        request_bodies = [
+            {
+                "id": f"{request_id}-{index}",
+                "method": method,
+                "params": params or {},
+                "jsonrpc": "2.0",
+            }
+            for index, (method, params) in enumerate(calls)
+        ]
+
+        log("debug", f"Making async batch request {[method for method, _ in calls]}")
+
+        result_bodies = await self._async_post_rpc(request_bodies)
+
+        if isinstance(result_bodies, dict):
+            error = result_bodies.get("error")
+            if isinstance(error, dict) and error.get("code") in BATCH_UNSUPPORTED_CODES:
+                log(
+                    "info",
+                    "Server does not support batch requests, sending them one by one",
+                )
+                self._batch_supported = False
+                return await self._async_batch_request_once(calls)
+
+            # a single error answers the whole batch, e.g. an expired session
+            result_bodies = [
+                {**result_bodies, "id": request_body["id"]}
+                for request_body in request_bodies
+            ]
+        elif not isinstance(result_bodies, list):
+            raise errors.RemoteError("Invalid batch response", result_bodies)
+
+        results_by_id = {
+            body.get("id"): body for body in result_bodies if isinstance(body, dict)
+        }
+
+        results = []
+        for request_body in request_bodies:
+            result_body = results_by_id.get(request_body["id"], {"id": request_body["id"]})
+            try:
+                results.append(_parse_rpc_result(request_body, result_body))
+            except errors.NotLoggedInError:
+                raise
+            except errors.Error as error:
+                results.append(error)
+
+        return results
+
+    def _cache_result(self, name, result_class, params, data):
+        """
+        Wrap data in a result object and store it in the session cache, like
+        the result_wrapper of the library does. Lazy lookups of the result
+        objects (e.g. lesson.subjects) are then answered from the cache.
+        """
+        try:
+            key = cache_key(name, params)
+        except TypeError:
+            key = cache_key(name, {"cache": str(params)})
+
+        self.cache[key] = result = result_class(session=self, data=data)
+        return result
+
+    async def _async_result(
+        self, name, result_class, method, params=None, from_cache=False
+    ):
+        """
+        Fetch a result object and store it in the session cache. With
+        from_cache, a cached result is returned without a request.
+        """
+        params = params or {}
+        if from_cache:
+            key = cache_key(name, params)
+            if key in self.cache:
+                return self.cache[key]
+
+        data = await self._async_request(method, params)
+        return self._cache_result(name, result_class, params, data)
+
+    async def async_login(self):
+        """Async version of login."""
+        try:
+            username = self.config["username"]
+            password = self.config["password"]
+            useragent = self.config["useragent"]
+        except KeyError as e:
+            raise errors.BadCredentialsError("Missing config: " + str(e))
+
+        res = await self._async_request(
+            "authenticate",
+            {"user": username, "password": password, "client": useragent},
+        )
+
+        if "sessionId" in res:
+            self.config["jsessionid"] = res["sessionId"]
+            log("debug", "Did get a jsessionid from the server")
+        else:
+            raise errors.AuthError("Something went wrong while authenticating", res)
+
+        self.login_result = {}
+        if "personType" in res:
+            self.login_result["personType"] = res["personType"]
+            self.login_result["personId"] = res["personId"]
+        if "klasseId" in res:
+            self.login_result["klasseId"] = res["klasseId"]
+
+        if self.on_login is not None:
+            await self.on_login()
+
+        return self
+
+    async def async_logout(self, suppress_errors=False):
+        """Async version of logout."""
+        try:
+            await self._async_request("logout")
+        except errors.NotLoggedInError:
+            if not suppress_errors:
+                raise
+
+        self.config["jsessionid"] = None
+
+    @staticmethod
+    def _set_current_schoolyear(schoolyears, current_data):
+        """Fill the lazy current property of the library from getCurrentSchoolyear"""
+        current = None
+        if current_data:
+            try:
+                current = schoolyears.filter(id=current_data["id"])[0]
+            except (IndexError, KeyError):
+                pass
+        schoolyears.__dict__["current"] = current
+
+    async def async_schoolyears(self):
+        """
+        Async version of schoolyears. The current schoolyear is fetched in the
+        same batch, so schoolyears.current does not need another request.
+        """
+        return (await self.async_master_data(lists=["schoolyears"]))["schoolyears"]
+
+    async def async_master_data(self, lists=tuple(MASTER_DATA_LISTS)):
+        """
+        Fetch master data lists in one batch request and store them in the
+        session cache.
+
+        :param lists: Names of the lists, keys of MASTER_DATA_LISTS
+        :return: Dict with the result object, or the raised exception, per list
+        """
+        calls = [(MASTER_DATA_LISTS[name][1], {}) for name in lists]
+        if "schoolyears" in lists:
+            calls.append(("getCurrentSchoolyear", {}))
+
+        results = await self._async_batch_request(calls)
+
+        master_data = {}
+        for name, data in zip(lists, results):
+            if isinstance(data, Exception):
+                master_data[name] = data
+            else:
+                master_data[name] = self._cache_result(
+                    name, MASTER_DATA_LISTS[name][0], {}, data
+                )
+
+        schoolyears = master_data.get("schoolyears")
+        if schoolyears is not None and not isinstance(schoolyears, Exception):
+            current_data = results[-1]
+            if isinstance(current_data, Exception):
+                master_data["schoolyears"] = current_data
+            else:
+                self._set_current_schoolyear(schoolyears, current_data)
+
+        return master_data
+
+    def master_data_as_dict(self):
+        """Return the JSON data of the cached master data lists, e.g. for a store"""
+        data = {}
+        for name in MASTER_DATA_LISTS:
+            key = cache_key(name, {})
+            if key in self.cache:
+                data[name] = [item._data for item in self.cache[key]]
+
+        key = cache_key("schoolyears", {})
+        if key in self.cache:
+            current = self.cache[key].__dict__.get("current")
+            data["current_schoolyear"] = current._data if current else None
+
+        return data
+
+    def restore_master_data(self, data):
+        """
+        Fill the session cache from master_data_as_dict data. The data may be
+        shared, the result objects get their own lists to replace items in.
+
+        :return: Dict with the result object per list
+        """
+        master_data = {
+            name: self._cache_result(
+                name, MASTER_DATA_LISTS[name][0], {}, list(data[name])
+            )
+            for name in MASTER_DATA_LISTS
+            if name in data
+        }
+        if "schoolyears" in master_data:
+            self._set_current_schoolyear(
+                master_data["schoolyears"], data.get("current_schoolyear")
+            )
+
+        return master_data
+
+    def clear_master_data(self, name):
+        """
+        Cache an empty list for master data the user has no rights for, so the
+        lazy lookups of the lessons do not request it.
+        """
+        return self._cache_result(name, MASTER_DATA_LISTS[name][0], {}, [])
+
+    async def async_last_import_time(self):
+        """
+        Async version of last_import_time, returns the raw timestamp of the
+        last timetable import in milliseconds.
+        """
+        return await self._async_request("getLatestImportTime")
+
+    async def async_holidays(self):
+        """Async version of holidays."""
+        return await self._async_result("holidays", objects.HolidayList, "getHolidays")
+
+    async def async_subjects(self, from_cache=False):
+        """Async version of subjects."""
+        return await self._async_result(
+            "subjects", objects.SubjectList, "getSubjects", from_cache=from_cache
+        )
+
+    async def async_klassen(self, from_cache=False):
+        """Async version of klassen."""
+        return await self._async_result(
+            "klassen", objects.KlassenList, "getKlassen", from_cache=from_cache
+        )
+
+    async def async_rooms(self, from_cache=False):
+        """Async version of rooms."""
+        return await self._async_result(
+            "rooms", objects.RoomList, "getRooms", from_cache=from_cache
+        )
+
+    async def async_teachers(self, from_cache=False):
+        """Async version of teachers."""
+        return await self._async_result(
+            "teachers", objects.TeacherList, "getTeachers", from_cache=from_cache
+        )
+
+    async def async_timetable_extended(self, start, end, **type_and_id):
+        """Async version of timetable_extended."""
+        if len(type_and_id) != 1:
+            raise TypeError(
+                "You have to specify exactly one of the following parameters by "
+                "keyword: " + ", ".join(ELEMENT_TYPES.keys())
+            )
+
+        element_type, element_id = next(iter(type_and_id.items()))
+
+        result_class, method, params = self._timetable_extended_raw(
+            end, start, element_id, ELEMENT_TYPES[element_type]
+        )
+        # timetables are not cached, they would push the lookup lists out of the cache
+        return result_class(session=self, data=await self._async_request(method, params))
+
+    async def async_my_timetable(self, start, end):
+        """Async version of my_timetable."""
+        result_class, method, params = self._timetable_extended_raw(
+            end,
+            start,
+            self.login_result["personId"],
+            self.login_result["personType"],
+        )
+        return result_class(session=self, data=await self._async_request(method, params))
+
+    async def _async_search(self, surname, fore_name, what):
+        """Async version of the person search, returns the person id."""
+        return await self._async_request(
+            "getPersonId", {"sn": surname, "fn": fore_name, "dob": 0, "type": what}
+        )
+
+    async def async_get_student(self, surname, fore_name):
+        """Async version of get_student."""
+        student_id = await self._async_search(
+            surname, fore_name, ELEMENT_TYPES["student"]
+        )
+        if not student_id:
+            raise KeyError("Student not found")
+
+        data = {
+            "id": student_id,
+            "name": surname,
+            "longName": surname,
+            "foreName": fore_name,
+        }
+        return objects.StudentObject(data=data, session=self)
+
+    async def async_get_teacher(self, surname, fore_name):
+        """Async version of get_teacher."""
+        teacher_id = await self._async_search(
+            surname, fore_name, ELEMENT_TYPES["teacher"]
+        )
+        if not teacher_id:
+            raise KeyError("Teacher not found")
+
+        data = {
+            "id": teacher_id,
+            "name": surname,
+            "longName": surname,
+            "foreName": fore_name,
+            "title": "",
+        }
+        return objects.TeacherObject(data=data, session=self)
+
+    def _prepare_custom_request(self, endpoint):
+        """
+        Build the URL and headers for a request to a custom endpoint.
 
         :param endpoint: The API endpoint for the custom request (e.g., '/api/homeworks/lessons')
-        :param params: The query parameters for the request
-        :return: JSON response from the API
+        :return: Tuple of URL and headers
         """
 
         base_url = self.config["server"].replace("/WebUntis/jsonrpc.do", "")
@@ -41,11 +616,42 @@ class ExtendedSession(WebUntisSession):
         else:
             raise errors.NotLoggedInError("No JSESSIONID found. Please log in first.")
 
+        return url, headers
+
+    def _send_custom_request(self, endpoint, params):
+        """
+        A custom method for sending a request to a specific endpoint, different from the JSON-RPC method.
+        Logs in again and retries once if the session is not valid anymore.
+
+        :param endpoint: The API endpoint for the custom request (e.g., '/api/homeworks/lessons')
+        :param params: The query parameters for the request
+        :return: JSON response from the API
+        """
+        try:
+            return self._send_custom_request_once(endpoint, params)
+        except errors.NotLoggedInError:
+            self.login()
+
+        return self._send_custom_request_once(endpoint, params)
+
+    def _send_custom_request_once(self, endpoint, params):
+        """Send a request to a custom endpoint without retry."""
+
+        url, headers = self._prepare_custom_request(endpoint)
+
         # Log the request details
         log("debug", f"Making custom request to {url} with params: {params}")
 
-        # Send the request using requests library
-        response = requests.get(url, params=params, headers=headers)
+        # Send the request through the rate limited session of the library
+        response = self.config["_http_session"].get(
+            url, params=params, headers=headers, timeout=self.timeout
+        )
+
+        if response.status_code == 401:
+            raise errors.NotLoggedInError(f"Session rejected by {url}")
+        if response.status_code == 403:
+            # the session is valid, the user has no right for the endpoint
+            raise errors.RemoteError(f"no right for {endpoint}")
 
         # Check if the response is valid JSON
         try:
@@ -56,6 +662,71 @@ class ExtendedSession(WebUntisSession):
 
         return response_data
 
+    async def _async_send_custom_request(self, endpoint, params):
+        """
+        Async version of _send_custom_request using the aiohttp session.
+
+        Transport errors are raised as OSError, like the requests library does.
+
+        :param endpoint: The API endpoint for the custom request (e.g., '/api/homeworks/lessons')
+        :param params: The query parameters for the request
+        :return: JSON response from the API
+        """
+        return await self._async_single_flight(
+            self._request_key(endpoint, params),
+            self._async_logged_in_call,
+            self._async_send_custom_request_once,
+            endpoint,
+            params,
+        )
+
+    async def _async_send_custom_request_once(self, endpoint, params):
+        """Send an async request to a custom endpoint without retry."""
+
+        url, headers = self._prepare_custom_request(endpoint)
+
+        # Log the request details
+        log("debug", f"Making async custom request to {url} with params: {params}")
+
+        await self.rate_limiter.async_acquire()
+        with self.rate_limiter.track():
+            try:
+                async with self._request_limit, self.http_session.get(
+                    url,
+                    params=params,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                ) as response:
+                    check_throttled(url, response.status)
+                    if response.status == 401:
+                        raise errors.NotLoggedInError(f"Session rejected by {url}")
+                    if response.status == 403:
+                        # the session is valid, the user has no right for it
+                        raise errors.RemoteError(f"no right for {endpoint}")
+                    response_text = await response.text()
+            except TimeoutError:
+                # a timeout is passed on as it is, it lowers the rate
+                raise
+            except aiohttp.ClientError as error:
+                raise OSError(f"Request to {url} failed: {error}") from error
+
+        # Check if the response is valid JSON
+        try:
+            response_data = json.loads(response_text)
+            log("debug", f"Received valid JSON response: {str(response_data)[:100]}")
+        except json.JSONDecodeError:
+            raise errors.RemoteError("Invalid JSON response", response_text)
+
+        return response_data
+
+    @staticmethod
+    def _date_range_params(start, end):
+        """Query parameters for the date range endpoints"""
+        return {
+            "startDate": start.strftime("%Y%m%d"),
+            "endDate": end.strftime("%Y%m%d"),
+        }
+
     def get_homeworks(self, start, end):
         """
         Fetch homeworks for lessons within a specific date range using the
@@ -68,14 +739,44 @@ class ExtendedSession(WebUntisSession):
         # Define the custom endpoint
         endpoint = "/WebUntis/api/homeworks/lessons"
 
-        # Set query parameters
-        params = {
-            "startDate": start.strftime("%Y%m%d"),
-            "endDate": end.strftime("%Y%m%d"),
-        }
-
         # Send the request and return the response
-        return self._send_custom_request(endpoint, params)
+        return self._send_custom_request(endpoint, self._date_range_params(start, end))
+
+    async def async_get_homeworks(self, start, end):
+        """Async version of get_homeworks."""
+        endpoint = "/WebUntis/api/homeworks/lessons"
+
+        return await self._async_send_custom_request(
+            endpoint, self._date_range_params(start, end)
+        )
+
+    @staticmethod
+    def _children(app_data):
+        """Return id and name of the students of a parent account"""
+        return [
+            {
+                "id": student["id"],
+                "name": student.get("displayName", str(student["id"])),
+            }
+            for student in app_data.get("user", {}).get("students", [])
+        ]
+
+    def get_children(self):
+        """
+        Fetch the students a parent account can see, using the
+        '/api/rest/view/v1/app/data' endpoint of the WebUntis app.
+
+        :return: List of dicts with id and name of the students
+        """
+        endpoint = "/WebUntis/api/rest/view/v1/app/data"
+
+        return self._children(self._send_custom_request(endpoint, {}))
+
+    async def async_get_children(self):
+        """Async version of get_children."""
+        endpoint = "/WebUntis/api/rest/view/v1/app/data"
+
+        return self._children(await self._async_send_custom_request(endpoint, {}))
 
     def get_exams(self, start, end):
         """
@@ -89,11 +790,13 @@ class ExtendedSession(WebUntisSession):
         # Define the custom endpoint
         endpoint = "/WebUntis/api/exams"
 
-        # Set query parameters
-        params = {
-            "startDate": start.strftime("%Y%m%d"),
-            "endDate": end.strftime("%Y%m%d"),
-        }
-
         # Send the request and return the response
-        return self._send_custom_request(endpoint, params)
+        return self._send_custom_request(endpoint, self._date_range_params(start, end))
+
+    async def async_get_exams(self, start, end):
+        """Async version of get_exams."""
+        endpoint = "/WebUntis/api/exams"
+
+        return await self._async_send_custom_request(
+            endpoint, self._date_range_params(start, end)
+        )
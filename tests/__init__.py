@@ -0,0 +1 @@
+"""Tests of the WebUntis integration"""
@@ -0,0 +1,59 @@
+"""Tests of the queue counters of the executor"""
+
+import asyncio
+import threading
+
+import pytest
+
+from custom_components.webuntis.utils.executor import WebUntisExecutor
+
+
+async def wait_until(condition):
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+def test_counters_after_the_jobs():
+    executor = WebUntisExecutor(max_workers=2)
+
+    async def run_jobs():
+        return await asyncio.gather(*(executor.async_run(pow, 2, n) for n in range(5)))
+
+    assert asyncio.run(run_jobs()) == [1, 2, 4, 8, 16]
+    assert executor.stats["queued"] == 0
+    assert executor.stats["running"] == 0
+    executor.shutdown()
+
+
+def test_cancelled_jobs_leave_the_queue():
+    executor = WebUntisExecutor(max_workers=1)
+    release = threading.Event()
+
+    async def run_jobs():
+        running = asyncio.ensure_future(executor.async_run(release.wait))
+        queued = asyncio.ensure_future(executor.async_run(release.wait))
+        await wait_until(lambda: executor.running == 1)
+        assert executor.stats["queued"] == 1
+
+        # the queued job is not started anymore, the running one finishes
+        queued.cancel()
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        await asyncio.sleep(0.05)
+        assert executor.stats["queued"] == 0
+        assert executor.stats["running"] == 1
+
+        release.set()
+        await wait_until(lambda: executor.running == 0)
+
+    try:
+        asyncio.run(run_jobs())
+    finally:
+        release.set()
+        executor.shutdown()
+    assert executor.stats["queued"] == 0
+    assert executor.stats["running"] == 0
@@ -0,0 +1,105 @@
+"""Tests of the rate limit of the requests to a WebUntis server"""
+
+import asyncio
+
+import pytest
+
+from custom_components.webuntis.const import RATE_LIMIT_MAX, RATE_LIMIT_MIN
+from custom_components.webuntis.utils.rate_limit import (
+    BlockingRequestError,
+    RateLimitedSession,
+    RateLimiter,
+    ThrottledError,
+    check_throttled,
+    rate_limit_host,
+)
+
+
+def test_rate_limit_host_normalizes_the_server():
+    assert rate_limit_host("Mese.WebUntis.com") == "mese.webuntis.com"
+    assert rate_limit_host(" https://mese.webuntis.com/WebUntis/jsonrpc.do ") == (
+        "mese.webuntis.com"
+    )
+
+
+def test_burst_then_wait_for_the_rate():
+    limiter = RateLimiter("host", rate=2, burst=2)
+
+    assert limiter._reserve() == 0
+    assert limiter._reserve() == 0
+    assert limiter._reserve() == pytest.approx(0.5, abs=0.05)
+    assert limiter.stats["requests"] == 3
+    assert limiter.stats["max_wait"] == pytest.approx(0.5, abs=0.05)
+
+
+def test_async_acquire_waits_for_a_token():
+    limiter = RateLimiter("host", rate=50, burst=1)
+
+    async def acquire_twice():
+        await limiter.async_acquire()
+        await limiter.async_acquire()
+
+    asyncio.run(acquire_twice())
+    assert limiter.last_wait > 0
+    assert limiter.waiting == 0
+
+
+def test_track_increases_the_rate_after_a_success():
+    limiter = RateLimiter("host", rate=2)
+
+    with limiter.track():
+        pass
+
+    assert limiter.rate == 2.5
+
+
+@pytest.mark.parametrize("error", [ThrottledError("429"), TimeoutError()])
+def test_track_halves_the_rate_when_throttled(error):
+    limiter = RateLimiter("host", rate=4)
+
+    with pytest.raises(type(error)), limiter.track():
+        raise error
+
+    assert limiter.rate == 2
+    assert limiter.throttled == 1
+
+
+def test_track_keeps_the_rate_on_other_errors():
+    limiter = RateLimiter("host", rate=4)
+
+    with pytest.raises(ConnectionRefusedError), limiter.track():
+        raise ConnectionRefusedError
+
+    assert limiter.rate == 4
+    assert limiter.throttled == 0
+
+
+def test_rate_stays_within_its_bounds():
+    limiter = RateLimiter("host", rate=RATE_LIMIT_MIN)
+    with pytest.raises(ThrottledError), limiter.track():
+        raise ThrottledError
+    assert limiter.rate == RATE_LIMIT_MIN
+
+    limiter = RateLimiter("host", rate=RATE_LIMIT_MAX)
+    with limiter.track():
+        pass
+    assert limiter.rate == RATE_LIMIT_MAX
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_check_throttled(status):
+    with pytest.raises(ThrottledError):
+        check_throttled("url", status)
+    check_throttled("url", 200)
+
+
+def test_blocking_request_from_the_event_loop_is_refused():
+    limiter = RateLimiter("host")
+    session = RateLimitedSession(limiter, timeout=1)
+
+    async def request():
+        session.get("http://127.0.0.1:1/")
+
+    with pytest.raises(BlockingRequestError):
+        asyncio.run(request())
+    assert limiter.requests == 0
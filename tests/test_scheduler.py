@@ -0,0 +1,123 @@
+"""Tests of the adaptive polling schedule"""
+
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.webuntis.const import (
+    HOLIDAY_HEARTBEAT,
+    SCAN_INTERVAL,
+    SCAN_INTERVAL_IDLE,
+    SCAN_INTERVAL_LEAD,
+    UPDATE_BACKOFF_MAX,
+    UPDATE_SLOW_DURATION,
+)
+from custom_components.webuntis.utils.scheduler import (
+    first_update_delay,
+    merge_holidays,
+    next_update_delay,
+    staggered_delay,
+    update_backoff,
+    update_phase,
+)
+
+DAY = date(2026, 10, 19)
+
+
+def lesson(start_hour, end_hour, day=DAY):
+    return SimpleNamespace(
+        start=datetime.combine(day, datetime.min.time()) + timedelta(hours=start_hour),
+        end=datetime.combine(day, datetime.min.time()) + timedelta(hours=end_hour),
+    )
+
+
+LESSONS = [lesson(8, 9), lesson(9, 13), lesson(8, 12, DAY + timedelta(days=1))]
+
+
+def at(hour, day=DAY):
+    return datetime.combine(day, datetime.min.time()) + timedelta(hours=hour)
+
+
+def test_without_timetable_the_scan_interval_is_used():
+    assert next_update_delay(at(10)) == SCAN_INTERVAL
+
+
+def test_scan_interval_during_the_lessons():
+    assert next_update_delay(at(10), LESSONS) == SCAN_INTERVAL
+
+
+def test_lead_interval_before_the_first_lesson():
+    assert next_update_delay(at(7.5), LESSONS) == SCAN_INTERVAL_LEAD
+    assert next_update_delay(at(7.99), LESSONS) == pytest.approx(36)
+
+
+def test_idle_interval_wakes_up_for_the_next_school_day():
+    assert next_update_delay(at(14), LESSONS) == SCAN_INTERVAL_IDLE
+    # the lead hour of the next day starts at 7:00
+    assert next_update_delay(at(6.5, DAY + timedelta(days=1)), LESSONS) == 30 * 60
+
+
+def test_heartbeat_in_holidays_and_after_the_schoolyear():
+    holidays = [(DAY - timedelta(days=3), DAY + timedelta(days=5))]
+    assert next_update_delay(at(10), LESSONS, holidays=holidays) == HOLIDAY_HEARTBEAT
+    assert (
+        next_update_delay(at(10), LESSONS, schoolyear_end=DAY - timedelta(days=1))
+        == HOLIDAY_HEARTBEAT
+    )
+
+
+def test_merge_holidays():
+    first = date(2026, 10, 1)
+    assert merge_holidays(
+        [
+            (first + timedelta(days=5), first + timedelta(days=6)),
+            (first, first + timedelta(days=2)),
+            (first + timedelta(days=3), first + timedelta(days=4)),
+            (first + timedelta(days=9), first + timedelta(days=9)),
+        ]
+    ) == [
+        [first, first + timedelta(days=6)],
+        [first + timedelta(days=9), first + timedelta(days=9)],
+    ]
+
+
+def test_update_backoff():
+    assert update_backoff(0, UPDATE_SLOW_DURATION) == 0
+    assert update_backoff(0, UPDATE_SLOW_DURATION + 1) == SCAN_INTERVAL
+    assert update_backoff(SCAN_INTERVAL, UPDATE_SLOW_DURATION + 1) == 2 * SCAN_INTERVAL
+    assert update_backoff(UPDATE_BACKOFF_MAX, UPDATE_SLOW_DURATION + 1) == (
+        UPDATE_BACKOFF_MAX
+    )
+    assert update_backoff(UPDATE_BACKOFF_MAX, 1) == 0
+
+
+def test_update_phase_is_stable():
+    phase = update_phase("entry")
+    assert phase == update_phase("entry")
+    assert 0 <= phase < 1
+    assert phase != update_phase("other entry")
+
+
+def test_first_update_delay_is_the_slot_of_the_entry():
+    phase = 0.25
+    timestamp = 1_000_000.0
+    delay = first_update_delay(timestamp, phase)
+
+    assert 0 <= delay < SCAN_INTERVAL
+    assert (timestamp + delay) % SCAN_INTERVAL == pytest.approx(phase * SCAN_INTERVAL)
+
+
+def test_staggered_delay_spreads_the_entries():
+    timestamp = 1_000_000.0
+    delays = {
+        staggered_delay(timestamp, SCAN_INTERVAL, phase) for phase in (0, 0.25, 0.5)
+    }
+
+    assert len(delays) == 3
+    for delay in delays:
+        assert SCAN_INTERVAL / 2 <= delay <= SCAN_INTERVAL * 3 / 2
+
+
+def test_staggered_delay_is_at_least_a_second():
+    assert staggered_delay(1_000_000.0, 0, 0.5) >= 1
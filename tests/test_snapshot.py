@@ -0,0 +1,87 @@
+"""Tests of the tiered timetable cache"""
+
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from custom_components.webuntis.utils.snapshot import TimetableCache
+
+TODAY = date(2026, 10, 19)
+NOW = datetime(2026, 10, 19, 10)
+# today and tomorrow every cycle, the rest of the week hourly, then every 6h
+TIERS = ((0, 1, 0), (2, 7, 60 * 60), (8, 14, 6 * 60 * 60))
+
+
+def lesson(day, hour=8):
+    start = datetime.combine(day, datetime.min.time()) + timedelta(hours=hour)
+    return SimpleNamespace(start=start, end=start + timedelta(minutes=45))
+
+
+def day(offset):
+    return TODAY + timedelta(days=offset)
+
+
+def filled_cache():
+    cache = TimetableCache(TIERS)
+    cache.update(day(0), day(14), [lesson(day(offset)) for offset in range(15)], NOW)
+    return cache
+
+
+def test_everything_is_stale_without_data():
+    assert TimetableCache(TIERS).stale_ranges(day(0), day(14), NOW) == [
+        (day(0), day(14))
+    ]
+
+
+def test_today_and_tomorrow_expire_every_cycle():
+    cache = filled_cache()
+
+    assert cache.stale_ranges(day(0), day(14), NOW + timedelta(minutes=10)) == [
+        (day(0), day(1))
+    ]
+
+
+def test_the_week_expires_hourly():
+    cache = filled_cache()
+
+    assert cache.stale_ranges(day(0), day(14), NOW + timedelta(hours=1)) == [
+        (day(0), day(7))
+    ]
+
+
+def test_the_far_days_expire_last():
+    cache = filled_cache()
+
+    assert cache.stale_ranges(day(0), day(14), NOW + timedelta(hours=6)) == [
+        (day(0), day(14))
+    ]
+
+
+def test_update_replaces_the_fetched_days():
+    cache = filled_cache()
+    cache.update(day(0), day(1), [lesson(day(1), 9)], NOW + timedelta(minutes=10))
+
+    snapshot = cache.snapshot(day(0), day(14), TODAY)
+    assert len(snapshot.get_lessons(day(0), day(0))) == 0
+    assert [item.start.hour for item in snapshot.get_lessons(day(1), day(1))] == [9]
+    assert cache.stale_ranges(day(0), day(14), NOW + timedelta(minutes=10)) == [
+        (day(0), day(1))
+    ]
+
+
+def test_evicted_days_are_fetched_again():
+    cache = filled_cache()
+    cache.evict(day(2), day(14))
+
+    assert cache.snapshot(day(0), day(14), TODAY) is None
+    assert cache.stale_ranges(day(0), day(14), NOW) == [(day(0), day(1))]
+
+
+def test_snapshot_covers_the_cached_days_around_today():
+    cache = TimetableCache(TIERS)
+    cache.update(day(0), day(3), [lesson(day(0)), lesson(day(3))], NOW)
+    cache.update(day(5), day(6), [lesson(day(5))], NOW)
+
+    snapshot = cache.snapshot(day(0), day(6), TODAY)
+    assert snapshot.covers(day(0), day(3))
+    assert not snapshot.covers(day(0), day(5))
+    assert len(snapshot) == 2
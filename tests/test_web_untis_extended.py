@@ -0,0 +1,181 @@
+"""Tests of the batch requests and the re-login of the ExtendedSession"""
+
+import asyncio
+from collections import Counter
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from webuntis import errors
+
+from custom_components.webuntis.utils.web_untis_extended import ExtendedSession
+
+RESULTS = {
+    "getSchoolyears": [
+        {"id": 1, "name": "2026/2027", "startDate": 20260901, "endDate": 20270731}
+    ],
+    "getCurrentSchoolyear": {
+        "id": 1,
+        "name": "2026/2027",
+        "startDate": 20260901,
+        "endDate": 20270731,
+    },
+    "getSubjects": [{"id": 1, "name": "M", "longName": "Math"}],
+    "getKlassen": [{"id": 1, "name": "1a", "longName": "1a"}],
+    "getRooms": [{"id": 1, "name": "R1", "longName": "Room 1"}],
+}
+
+
+class FakeServer:
+    """JSON-RPC endpoint of a WebUntis server"""
+
+    def __init__(self) -> None:
+        self.batch = True
+        self.batch_error = False
+        self.sessions = set()
+        self.posts = 0
+        self.calls = Counter()
+
+    def _answer(self, call, jsessionid):
+        self.calls[call["method"]] += 1
+        if call["method"] == "authenticate":
+            session_id = f"session{len(self.sessions)}"
+            self.sessions.add(session_id)
+            return {
+                "jsonrpc": "2.0",
+                "id": call["id"],
+                "result": {"sessionId": session_id},
+            }
+        if jsessionid not in self.sessions:
+            error = {"code": -8520, "message": "not authenticated"}
+            return {"jsonrpc": "2.0", "id": call["id"], "error": error}
+        if call["method"] not in RESULTS:
+            error = {"code": -8509, "message": "no right for " + call["method"]}
+            return {"jsonrpc": "2.0", "id": call["id"], "error": error}
+        return {"jsonrpc": "2.0", "id": call["id"], "result": RESULTS[call["method"]]}
+
+    async def handle(self, request):
+        self.posts += 1
+        body = await request.json()
+        jsessionid = request.cookies.get("JSESSIONID")
+        if isinstance(body, list):
+            if not self.batch:
+                error = {"code": -32600, "message": "Invalid Request"}
+                return web.json_response({"jsonrpc": "2.0", "id": None, "error": error})
+            if self.batch_error and jsessionid not in self.sessions:
+                error = {"code": -8520, "message": "not authenticated"}
+                return web.json_response({"jsonrpc": "2.0", "id": None, "error": error})
+            return web.json_response([self._answer(call, jsessionid) for call in body])
+        return web.json_response(self._answer(body, jsessionid))
+
+
+def run(test):
+    """Run test with a logged in session of a fake server"""
+
+    async def run_test():
+        server = FakeServer()
+        app = web.Application()
+        app.router.add_post("/WebUntis/jsonrpc.do", server.handle)
+        async with TestServer(app) as test_server, aiohttp.ClientSession() as http:
+            session = ExtendedSession(
+                server=str(test_server.make_url("/WebUntis/jsonrpc.do")),
+                school="school",
+                username="user",
+                password="secret",
+                useragent="test",
+                http_session=http,
+            )
+            await session.async_login()
+            server.posts = 0
+            server.calls.clear()
+            await test(server, session)
+
+    asyncio.run(run_test())
+
+
+def test_master_data_in_one_batch():
+    async def test(server, session):
+        master_data = await session.async_master_data(
+            lists=["schoolyears", "subjects", "klassen", "rooms"]
+        )
+
+        assert server.posts == 1
+        assert [subject.long_name for subject in master_data["subjects"]] == ["Math"]
+        assert master_data["schoolyears"].current.id == 1
+        assert session._batch_supported
+
+    run(test)
+
+
+def test_error_of_one_call_is_returned_in_its_place():
+    async def test(server, session):
+        master_data = await session.async_master_data(lists=["rooms", "teachers"])
+
+        assert server.posts == 1
+        assert len(master_data["rooms"]) == 1
+        assert isinstance(master_data["teachers"], errors.RemoteError)
+        assert "no right for getTeachers" in str(master_data["teachers"])
+
+    run(test)
+
+
+def test_fallback_to_single_requests():
+    async def test(server, session):
+        server.batch = False
+
+        master_data = await session.async_master_data(lists=["subjects", "rooms"])
+
+        assert not session._batch_supported
+        assert len(master_data["subjects"]) == 1
+        assert len(master_data["rooms"]) == 1
+        # the batch, then one request per call
+        assert server.posts == 3
+
+        server.posts = 0
+        await session.async_master_data(lists=["subjects", "rooms"])
+        assert server.posts == 2
+
+    run(test)
+
+
+def test_relogin_when_the_calls_of_a_batch_are_rejected():
+    async def test(server, session):
+        server.sessions.clear()
+
+        master_data = await session.async_master_data(lists=["subjects", "rooms"])
+
+        assert server.calls["authenticate"] == 1
+        assert len(master_data["subjects"]) == 1
+        assert session._batch_supported
+
+    run(test)
+
+
+def test_relogin_when_the_whole_batch_is_rejected():
+    async def test(server, session):
+        server.batch_error = True
+        server.sessions.clear()
+
+        master_data = await session.async_master_data(lists=["subjects", "rooms"])
+
+        assert server.calls["authenticate"] == 1
+        assert len(master_data["rooms"]) == 1
+        # a single error of the batch does not turn batching off
+        assert session._batch_supported
+
+    run(test)
+
+
+def test_concurrent_requests_share_one_relogin():
+    async def test(server, session):
+        server.sessions.clear()
+
+        await asyncio.gather(
+            session.async_master_data(lists=["subjects"]),
+            session.async_master_data(lists=["rooms"]),
+            session.async_master_data(lists=["klassen"]),
+        )
+
+        assert server.calls["authenticate"] == 1
+
+    run(test)